@@ -303,7 +303,8 @@ Be realistic about data requirements and accuracy targets. Focus on opportunitie
             agent="ai_opportunities_generator",
             prompt=prompt,
             preferred_model="gpt-4o",  # Use premium model for strategic analysis
-            escalate_on_low_confidence=False
+            escalate_on_low_confidence=False,
+            use_cache=True,
         )
 
         # Parse JSON response
@@ -0,0 +1,53 @@
+"""Atomic Write - Replace a file without exposing a half-written version.
+
+atomic_write_text() writes to a temp file in the target's directory and
+renames it over the target. tempfile.mkstemp creates the temp file as
+owner-only (0600), so it is given the target's existing mode, or the
+mode a plain open() would have used (0666 less the umask), before the
+rename. Files such as the KPI dashboard stay readable by a web server
+running as another user.
+
+Usage:
+    from agent.atomic_write import atomic_write_text
+
+    atomic_write_text(output_file, payload)
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+# Read the process umask once; os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _target_mode(path: Path) -> int:
+    """Permission bits for path: its current mode, or the umask default."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to path atomically (temp file, then rename).
+
+    Args:
+        path: File to create or replace; its directory must exist
+        text: Content to write (UTF-8)
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(tmp_name, _target_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
@@ -289,7 +289,8 @@ Focus on realistic, actionable automation opportunities. Be specific about techn
             agent="automation_candidates_generator",
             prompt=prompt,
             preferred_model="gpt-4o",  # Use premium model for analysis
-            escalate_on_low_confidence=False
+            escalate_on_low_confidence=False,
+            use_cache=True,
         )
 
         # Parse JSON response
@@ -271,7 +271,8 @@ Be realistic about timelines and resources. Focus on delivering value incrementa
             agent="automation_roadmap_generator",
             prompt=prompt,
             preferred_model="gpt-4o",  # Use premium model for strategic planning
-            escalate_on_low_confidence=False
+            escalate_on_low_confidence=False,
+            use_cache=True,
         )
 
         # Parse JSON response
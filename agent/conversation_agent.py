@@ -8,7 +8,7 @@ Features:
 - Only asks about gaps (never re-asks what's known)
 - Role-aware: adjusts depth and vocabulary based on user role
 - Incremental: appends new knowledge to knowledge_base.json
-- Cost-tracked: logs all API calls to cost_log.json
+- Cost-tracked: logs all API calls to cost_log.jsonl
 
 The agent operates in two modes:
 1. Interviewing mode: guides user through gap-filling questions
@@ -201,7 +201,7 @@ class ConversationAgent:
                 )
 
         # Step 3: Get FRESH gap brief (now includes any newly extracted facts)
-        gap_brief = self.gap_analyzer.analyze_project(project_id)
+        gap_brief = self.gap_analyzer.analyze_project(project_id, include_knowledge_summary=False)
         if gap_brief.get("status") != "success":
             return _wrap("Error loading project gaps. Please ensure the project exists and has a knowledge base.")
 
@@ -40,12 +40,13 @@ class DataFlowGenerator:
         """
         self.projects_root = Path(projects_root)
 
-    def generate_data_flow(self, project_id: str) -> Dict[str, Any]:
+    def generate_data_flow(self, project_id: str, output_dir: Optional[Path] = None) -> Dict[str, Any]:
         """
         Generate Data Flow Diagram from project knowledge base.
 
         Args:
             project_id: ID of the project to analyze
+            output_dir: Optional directory to save into (defaults to the phase folder)
 
         Returns:
             Dict with data flow structure
@@ -109,7 +110,7 @@ class DataFlowGenerator:
                 }
             }
 
-            self._save_deliverable(project_id, deliverable_data)
+            self._save_deliverable(project_id, deliverable_data, output_dir)
 
             return {
                 "status": "success" if not missing else "partial",
@@ -225,9 +226,9 @@ class DataFlowGenerator:
 
         return flows
 
-    def _save_deliverable(self, project_id: str, data: Dict[str, Any]) -> None:
-        """Save data flow diagram to project deliverables folder."""
-        deliverable_path = (
+    def _save_deliverable(self, project_id: str, data: Dict[str, Any], output_dir: Optional[Path] = None) -> None:
+        """Save data flow diagram to project deliverables folder (or output_dir if given)."""
+        deliverable_path = output_dir or (
             self.projects_root / project_id / "deliverables" / "3-digitization"
         )
         deliverable_path.mkdir(parents=True, exist_ok=True)
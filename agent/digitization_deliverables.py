@@ -8,6 +8,7 @@ Author: Intelligent Automation Agent
 """
 
 import json
+import os
 import shutil
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -27,20 +28,38 @@ class DigitizationDeliverablesOrchestrator:
         self.arch_gen = SystemArchitectureGenerator(projects_root)
         self.data_flow_gen = DataFlowGenerator(projects_root)
 
+    def _lang_output_dir(self, project_id: str, languages: Optional[List[str]]) -> Optional[Path]:
+        """Directory generators write into directly: the first language subdirectory, if any."""
+        if not languages:
+            return None
+        return self.projects_root / project_id / "deliverables" / self.PHASE_DIR / languages[0]
+
     def _copy_to_lang_dirs(self, project_id: str, filename: str, languages: List[str]) -> Dict[str, str]:
-        """Copy a generated deliverable file to each language subdirectory."""
+        """
+        Propagate a deliverable written to the first language subdirectory to the others.
+
+        The generator has already saved into ``languages[0]``, so the remaining
+        languages get a hardlink to that file (falling back to a copy where the
+        filesystem does not support links). No base-dir file is written or removed.
+        """
         base_dir = self.projects_root / project_id / "deliverables" / self.PHASE_DIR
-        source = base_dir / filename
+        source = base_dir / languages[0] / filename
         paths = {}
-        if not source.exists():
+        try:
+            source.stat()
+        except FileNotFoundError:
             return paths
-        for lang in languages:
+        paths[languages[0]] = str(source)
+        for lang in languages[1:]:
             lang_dir = base_dir / lang
             lang_dir.mkdir(parents=True, exist_ok=True)
             dest = lang_dir / filename
-            shutil.copy2(str(source), str(dest))
+            dest.unlink(missing_ok=True)
+            try:
+                os.link(source, dest)
+            except OSError:
+                shutil.copy2(str(source), str(dest))
             paths[lang] = str(dest)
-        source.unlink(missing_ok=True)
         return paths
 
     def generate_all_deliverables(self, project_id: str, languages: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -58,11 +77,12 @@ class DigitizationDeliverablesOrchestrator:
             "files_saved": {},
             "completeness_by_deliverable": {}
         }
+        output_dir = self._lang_output_dir(project_id, languages)
 
         # Generate System Architecture
         print("\n[1/2] Generating System Architecture...")
         try:
-            arch_result = self.arch_gen.generate_system_architecture(project_id)
+            arch_result = self.arch_gen.generate_system_architecture(project_id, output_dir=output_dir)
             results["deliverables"]["system_architecture"] = arch_result
             results["completeness_by_deliverable"]["system_architecture"] = arch_result.get("completeness", {}).get("overall", 0)
             if arch_result.get("status") in ["success", "partial"]:
@@ -81,7 +101,7 @@ class DigitizationDeliverablesOrchestrator:
         # Generate Data Flow Diagram
         print("\n[2/2] Generating Data Flow Diagram...")
         try:
-            df_result = self.data_flow_gen.generate_data_flow(project_id)
+            df_result = self.data_flow_gen.generate_data_flow(project_id, output_dir=output_dir)
             results["deliverables"]["data_flow"] = df_result
             results["completeness_by_deliverable"]["data_flow"] = df_result.get("completeness", {}).get("overall", 0)
             if df_result.get("status") in ["success", "partial"]:
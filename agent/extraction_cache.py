@@ -0,0 +1,85 @@
+"""Extraction Cache - Reuse LLM extractions for identical file content.
+
+Stores the knowledge processor's parsed extraction for each file under
+projects/.extraction_cache/<key>.json, shared by all projects. The key
+covers the file content and the extraction configuration (model, prompt,
+schema version), so the same process document uploaded to a second
+project is extracted without another model call, while a change of
+configuration starts from a clean slate.
+
+Usage:
+    from agent.extraction_cache import ExtractionCache, extraction_cache_key
+
+    cache = ExtractionCache(projects_root)
+    key = extraction_cache_key(content_sha, model, system_prompt, schema_version)
+    extraction = cache.get(key)
+    if extraction is None:
+        extraction = ...  # call the LLM
+        cache.put(key, extraction)
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from agent.atomic_write import atomic_write_text
+
+
+def extraction_cache_key(
+    content_sha: str, model: str, system_prompt: str, schema_version: int
+) -> str:
+    """Build a cache key for one file's extraction.
+
+    Args:
+        content_sha: Hash of the file's bytes
+        model: Model the extraction is requested from
+        system_prompt: Extraction instructions sent with the content
+        schema_version: Version of the extraction JSON schema
+
+    Returns:
+        Hex SHA-256 digest identifying content and configuration
+    """
+    digest = hashlib.sha256()
+    for part in (str(schema_version), model, system_prompt, content_sha):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Content-addressed, cross-project store of file extractions."""
+
+    def __init__(self, projects_root: Optional[Path] = None):
+        """Initialize the cache.
+
+        Args:
+            projects_root: Root directory for projects.
+                          Defaults to ./projects/
+        """
+        projects_root = Path(projects_root or (Path(__file__).parent.parent / "projects"))
+        self.cache_dir = projects_root / ".extraction_cache"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached extraction for key, or None on a miss."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, extraction: Dict[str, Any]) -> None:
+        """Store an extraction atomically (write to a temp file, then rename).
+
+        Concurrent writers of the same content produce the same file, so
+        the last rename simply wins.
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self._path(key), json.dumps(extraction, ensure_ascii=False))
+        except (IOError, OSError, TypeError, ValueError) as e:
+            # A cache write failure must not fail the extraction itself
+            print(f"Warning: Failed to cache extraction {key}: {e}")
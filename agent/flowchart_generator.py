@@ -13,6 +13,11 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 
+# Fixed Mermaid fragments shared by every call to _build_mermaid
+_HEADER = "graph TD\n"
+_EMPTY_GRAPH = "graph TD\n  Start[Start] --> End[End]\n"
+
+
 class FlowchartGenerator:
     """
     Generates Mermaid flowchart from process map data.
@@ -77,7 +82,16 @@ class FlowchartGenerator:
                     process_map = json.load(f)
 
             # Generate Mermaid code
-            mermaid_code = self._build_mermaid(process_map.get("process_map", {}))
+            map_data = process_map.get("process_map", {})
+            mermaid_code = self._build_mermaid(map_data)
+
+            # Counts mirror exactly what _build_mermaid emits: every step and
+            # decision plus Start/End as nodes; Start -> steps -> End chained,
+            # plus a Yes/No pair per decision. An empty map is Start --> End.
+            steps = map_data.get("steps", [])
+            decisions = map_data.get("decision_points", []) if steps else []
+            node_count = len(steps) + len(decisions) + 2
+            connection_count = len(steps) + 1 + 2 * len(decisions)
 
             result = {
                 "status": "success",
@@ -85,8 +99,8 @@ class FlowchartGenerator:
                 "timestamp": datetime.now().isoformat(),
                 "flowchart": {
                     "mermaid_code": mermaid_code,
-                    "node_count": mermaid_code.count("\n  "),
-                    "connection_count": mermaid_code.count("-->")
+                    "node_count": node_count,
+                    "connection_count": connection_count
                 }
             }
 
@@ -128,18 +142,14 @@ class FlowchartGenerator:
         Returns:
             Mermaid markdown code
         """
-        # Start flowchart
-        mermaid = "graph TD\n"
-
         steps = process_map.get("steps", [])
         decisions = process_map.get("decision_points", [])
-        performers = process_map.get("performers", [])
-        systems = process_map.get("systems", [])
 
         if not steps:
             # Empty flowchart
-            mermaid += "  Start[Start] --> End[End]\n"
-            return mermaid
+            return _EMPTY_GRAPH
+
+        parts = [_HEADER]
 
         # Create node IDs (sanitized for Mermaid)
         node_map = {}
@@ -147,48 +157,46 @@ class FlowchartGenerator:
             node_id = f"Step{i + 1}"
             sanitized_label = self._sanitize_label(step)
             node_map[step] = node_id
-            mermaid += f"  {node_id}[{sanitized_label}]\n"
+            parts.append(f"  {node_id}[{sanitized_label}]\n")
 
         # Add decision nodes
         for i, decision in enumerate(decisions):
             decision_id = f"Decision{i + 1}"
             sanitized_label = self._sanitize_label(decision)
-            mermaid += f"  {decision_id}{{{{✓ {sanitized_label}?}}}}\n"
+            parts.append(f"  {decision_id}{{{{✓ {sanitized_label}?}}}}\n")
 
         # Add START and END nodes
         start_node = "Start"
         end_node = "End"
-        mermaid += f"  {start_node}([Start])\n"
-        mermaid += f"  {end_node}([End])\n"
+        parts.append(f"  {start_node}([Start])\n")
+        parts.append(f"  {end_node}([End])\n")
 
         # Connect START to first step
-        if steps:
-            first_step = node_map[steps[0]]
-            mermaid += f"  {start_node} --> {first_step}\n"
+        first_node = node_map[steps[0]]
+        parts.append(f"  {start_node} --> {first_node}\n")
 
         # Connect steps in sequence
         for i in range(len(steps) - 1):
             current_node = node_map[steps[i]]
             next_node = node_map[steps[i + 1]]
-            mermaid += f"  {current_node} --> {next_node}\n"
+            parts.append(f"  {current_node} --> {next_node}\n")
 
         # Connect last step to END
-        if steps:
-            last_node = node_map[steps[-1]]
-            mermaid += f"  {last_node} --> {end_node}\n"
+        last_node = node_map[steps[-1]]
+        parts.append(f"  {last_node} --> {end_node}\n")
 
         # Add decision branches
         for i, decision in enumerate(decisions):
             decision_id = f"Decision{i + 1}"
-            mermaid += f"  {decision_id} -->|✓ Yes| {node_map[steps[0]] if steps else end_node}\n"
-            mermaid += f"  {decision_id} -->|✗ No| {end_node}\n"
+            parts.append(f"  {decision_id} -->|✓ Yes| {first_node}\n")
+            parts.append(f"  {decision_id} -->|✗ No| {end_node}\n")
 
         # Add style directives
-        mermaid += "\n  style Start fill:#90EE90\n"
-        mermaid += "  style End fill:#FFB6C6\n"
-        mermaid += "  style Decision1 fill:#87CEEB\n"
+        parts.append("\n  style Start fill:#90EE90\n")
+        parts.append("  style End fill:#FFB6C6\n")
+        parts.append("  style Decision1 fill:#87CEEB\n")
 
-        return mermaid
+        return "".join(parts)
 
     def _sanitize_label(self, text: str) -> str:
         """
@@ -20,13 +20,50 @@ Usage:
 """
 
 import json
-from datetime import datetime
+import sys
+import time
+from collections import Counter
+from itertools import compress
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
+from agent.json_cache import cached_load
 from agent.llm import call_model
 from agent.validators import validate_project_id
 
+try:
+    import ahocorasick  # optional: pyahocorasick, single-pass multi-field scan
+except ImportError:
+    ahocorasick = None
+
+
+# Fact keys whose values can mention a deliverable field
+_FACT_TEXT_KEYS = ("category", "fact", "text", "description", "value", "field")
+
+
+def _fact_text(fact: Any) -> str:
+    """Return only the text-bearing values of a fact (or the fact itself if not a dict)."""
+    if isinstance(fact, dict):
+        return " ".join(str(fact[key]) for key in _FACT_TEXT_KEYS if key in fact)
+    return str(fact)
+
+
+# Built lazily from GapAnalyzer.STANDARDIZATION_REQUIREMENTS on first use
+_FIELD_AUTOMATON = None
+
+
+def _field_automaton(requirements: Dict[str, Dict[str, Any]]):
+    """Return the shared Aho-Corasick automaton over all requirement fields, or None."""
+    global _FIELD_AUTOMATON
+    if _FIELD_AUTOMATON is None and ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for req in requirements.values():
+            for field in req["fields_lower"]:
+                automaton.add_word(field, field)
+        automaton.make_automaton()
+        _FIELD_AUTOMATON = automaton
+    return _FIELD_AUTOMATON
+
 
 class GapAnalyzer:
     """Analyzes gaps between knowledge and deliverable requirements."""
@@ -70,7 +107,7 @@ class GapAnalyzer:
             projects_root or (Path(__file__).parent.parent / "projects")
         )
 
-    def analyze_project(self, project_id: str) -> Dict[str, Any]:
+    def analyze_project(self, project_id: str, include_knowledge_summary: bool = True) -> Dict[str, Any]:
         """Analyze gaps for a project in its current phase.
 
         Compares knowledge_base.json against deliverable requirements
@@ -78,10 +115,12 @@ class GapAnalyzer:
 
         Args:
             project_id: The project ID to analyze
+            include_knowledge_summary: Set False to skip the per-category fact
+                count for callers that only need the gaps
 
         Returns:
-            Dictionary with keys: phase, current_deliverables, knowledge_summary,
-            deliverable_gaps, recommendations, next_steps
+            Dictionary with keys: phase, current_deliverables, knowledge_summary
+            (unless disabled), deliverable_gaps, recommendations, next_steps
         """
         # Validate project_id to prevent path traversal attacks
         if not validate_project_id(project_id):
@@ -108,6 +147,13 @@ class GapAnalyzer:
         phase_data = project_json.get("phases", {}).get(phase, {})
         deliverables = phase_data.get("deliverables", {})
 
+        # Lowercase the fact corpus once and find every requirement field in it
+        # up front; each deliverable then only does set lookups
+        facts_blob = "\n".join(
+            _fact_text(fact).lower() for fact in knowledge_base.get("facts", [])
+        )
+        found_in_facts = self._find_fields(facts_blob)
+
         # Analyze gaps per deliverable
         deliverable_gaps = []
         for deliverable_key, deliverable_info in deliverables.items():
@@ -118,62 +164,63 @@ class GapAnalyzer:
                 continue
 
             gaps = self._analyze_deliverable_gaps(
-                deliverable_key, requirements, knowledge_base
+                deliverable_key, requirements, knowledge_base, found_in_facts
             )
             if gaps:
                 deliverable_gaps.append(gaps)
 
-        # Generate recommendations
+        # Summarize gaps in one pass, then generate recommendations
+        gap_summary = self._summarize_gaps(deliverable_gaps)
         recommendations = self._generate_recommendations(
-            deliverable_gaps, knowledge_base, project_json
+            gap_summary, knowledge_base, project_json
         )
 
-        return {
+        result = {
             "status": "success",
             "project_id": project_id,
             "phase": phase,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "knowledge_summary": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        if include_knowledge_summary:
+            result["knowledge_summary"] = {
                 "facts_count": len(knowledge_base.get("facts", [])),
                 "sources_count": len(knowledge_base.get("sources", [])),
                 "categories": self._summarize_facts_by_category(
                     knowledge_base.get("facts", [])
                 ),
-            },
+            }
+        result.update({
             "deliverable_gaps": deliverable_gaps,
-            "overall_completeness_pct": self._calculate_overall_completeness(
-                deliverable_gaps
-            ),
-            "overall_completeness": self._calculate_overall_completeness(
-                deliverable_gaps
-            ),
+            "overall_completeness_pct": gap_summary["overall_pct"],
+            "overall_completeness": gap_summary["overall_pct"],
             "recommendations": recommendations,
-            "next_steps": self._recommend_next_steps(deliverable_gaps),
-        }
+            "next_steps": self._recommend_next_steps(gap_summary),
+        })
+        return result
 
     def _analyze_deliverable_gaps(
-        self, deliverable_key: str, requirements: Dict[str, Any], knowledge_base: Dict[str, Any]
+        self,
+        deliverable_key: str,
+        requirements: Dict[str, Any],
+        knowledge_base: Dict[str, Any],
+        found_in_facts: Set[str],
     ) -> Dict[str, Any]:
-        """Analyze gaps for a single deliverable."""
-        facts = knowledge_base.get("facts", [])
-        missing_fields = []
-        found_fields = []
-
-        for field in requirements.get("fields", []):
-            # Simple heuristic: check if any fact mentions the field
-            found = any(
-                field.lower() in str(fact).lower() for fact in facts
-            )
-            if found:
-                found_fields.append(field)
-            else:
-                missing_fields.append(field)
+        """Analyze gaps for a single deliverable.
 
-        completeness = (
-            len(found_fields) / len(requirements.get("fields", []))
-            if requirements.get("fields")
-            else 0
-        ) * 100
+        Args:
+            deliverable_key: Deliverable being analyzed
+            requirements: Requirement spec from STANDARDIZATION_REQUIREMENTS
+            knowledge_base: Loaded knowledge base
+            found_in_facts: Lowercased fields mentioned by any fact (see _find_fields)
+        """
+        fields = requirements["fields"]
+
+        # Simple heuristic: a field is found if any fact mentions it
+        presence = tuple(field in found_in_facts for field in requirements["fields_lower"])
+        found_fields = list(compress(fields, presence))
+        missing_fields = list(compress(fields, (not p for p in presence)))
+
+        completeness = (len(found_fields) / len(fields) if fields else 0) * 100
 
         return {
             "deliverable": deliverable_key,
@@ -187,6 +234,22 @@ class GapAnalyzer:
             ),
         }
 
+    def _find_fields(self, facts_blob: str) -> Set[str]:
+        """Return the lowercased requirement fields that occur anywhere in facts_blob.
+
+        Uses one Aho-Corasick pass when pyahocorasick is installed, otherwise
+        one substring scan per field.
+        """
+        automaton = _field_automaton(self.STANDARDIZATION_REQUIREMENTS)
+        if automaton is not None:
+            return {field for _, field in automaton.iter(facts_blob)}
+        return {
+            field
+            for req in self.STANDARDIZATION_REQUIREMENTS.values()
+            for field in req["fields_lower"]
+            if field in facts_blob
+        }
+
     def _recommend_for_deliverable(
         self, deliverable_key: str, missing_fields: List[str], knowledge_base: Dict[str, Any]
     ) -> str:
@@ -212,23 +275,35 @@ class GapAnalyzer:
 
     def _summarize_facts_by_category(self, facts: List[Dict[str, Any]]) -> Dict[str, int]:
         """Count facts by category."""
-        categories = {}
-        for fact in facts:
-            cat = fact.get("category", "unknown")
-            categories[cat] = categories.get(cat, 0) + 1
-        return categories
-
-    def _calculate_overall_completeness(self, deliverable_gaps: List[Dict[str, Any]]) -> int:
-        """Calculate average completeness across all deliverables."""
-        if not deliverable_gaps:
-            return 0
-        avg = sum(d.get("completeness_pct", 0) for d in deliverable_gaps) / len(
-            deliverable_gaps
-        )
-        return int(avg)
+        return dict(Counter(fact.get("category", "unknown") for fact in facts))
+
+    def _summarize_gaps(self, deliverable_gaps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Walk deliverable_gaps once, collecting everything the report needs.
+
+        Returns:
+            Dict with overall_pct (average completeness), incomplete and
+            critical_incomplete (deliverable keys below 80%) and all_complete
+        """
+        total_pct = 0
+        incomplete = []
+        critical_incomplete = []
+        for gap in deliverable_gaps:
+            pct = gap.get("completeness_pct", 0)
+            total_pct += pct
+            if pct < 80:
+                incomplete.append(gap["deliverable"])
+                if gap.get("importance") == "critical":
+                    critical_incomplete.append(gap["deliverable"])
+
+        return {
+            "overall_pct": int(total_pct / len(deliverable_gaps)) if deliverable_gaps else 0,
+            "incomplete": incomplete,
+            "critical_incomplete": critical_incomplete,
+            "all_complete": not incomplete,
+        }
 
     def _generate_recommendations(
-        self, deliverable_gaps: List[Dict[str, Any]], knowledge_base: Dict[str, Any], project_json: Dict[str, Any]
+        self, gap_summary: Dict[str, Any], knowledge_base: Dict[str, Any], project_json: Dict[str, Any]
     ) -> List[str]:
         """Generate overall recommendations."""
         recs = []
@@ -246,32 +321,22 @@ class GapAnalyzer:
             recs.append(f"There are {len(unknowns)} questions raised: prioritize clarifying these.")
 
         # Check completeness
-        all_complete = all(
-            d.get("completeness_pct", 0) >= 80 for d in deliverable_gaps
-        )
-        if not all_complete:
-            incomplete = [
-                d["deliverable"] for d in deliverable_gaps
-                if d.get("completeness_pct", 0) < 80
-            ]
-            recs.append(f"Complete the following: {', '.join(incomplete)}")
+        if not gap_summary["all_complete"]:
+            recs.append(f"Complete the following: {', '.join(gap_summary['incomplete'])}")
         else:
             recs.append("All deliverables appear > 80% complete. Ready for gate review.")
 
         return recs
 
-    def _recommend_next_steps(self, deliverable_gaps: List[Dict[str, Any]]) -> List[str]:
-        """Recommend next steps based on gaps."""
+    def _recommend_next_steps(self, gap_summary: Dict[str, Any]) -> List[str]:
+        """Recommend next steps based on the gap summary."""
         steps = []
 
         # Find most critical gap
-        critical = [d for d in deliverable_gaps if d.get("importance") == "critical"]
-        if critical:
-            incomplete_critical = [d for d in critical if d.get("completeness_pct", 0) < 80]
-            if incomplete_critical:
-                steps.append(
-                    f"1. Complete critical deliverable: {incomplete_critical[0]['deliverable']}"
-                )
+        if gap_summary["critical_incomplete"]:
+            steps.append(
+                f"1. Complete critical deliverable: {gap_summary['critical_incomplete'][0]}"
+            )
 
         # Suggest conversation
         steps.append("2. Run Conversation Agent to fill identified gaps")
@@ -281,28 +346,32 @@ class GapAnalyzer:
         return steps
 
     def _load_knowledge_base(self, extracted_path: Path) -> Dict[str, Any]:
-        """Load knowledge_base.json."""
+        """Load knowledge_base.json (shared via the JSON cache; read-only)."""
         kb_path = extracted_path / "knowledge_base.json"
         if kb_path.exists():
             try:
-                with open(kb_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return cached_load(kb_path)
             except Exception:
                 pass
         return {"facts": [], "sources": []}
 
     def _load_project_json(self, project_path: Path) -> Optional[Dict[str, Any]]:
-        """Load project.json."""
+        """Load project.json (shared via the JSON cache; read-only)."""
         proj_file = project_path / "project.json"
         if proj_file.exists():
             try:
-                with open(proj_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return cached_load(proj_file)
             except Exception:
                 pass
         return None
 
 
+# Freeze requirement field lists and lowercase (and intern) them once at import time
+for _req in GapAnalyzer.STANDARDIZATION_REQUIREMENTS.values():
+    _req["fields"] = tuple(_req["fields"])
+    _req["fields_lower"] = tuple(sys.intern(field.lower()) for field in _req["fields"])
+
+
 if __name__ == "__main__":
     # Quick test: analyze test-project
     ga = GapAnalyzer()
@@ -25,14 +25,29 @@ Usage:
         print(f"Feedback: {result['feedback']}")
 """
 
+import copy
 import json
-from datetime import datetime
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from agent.json_cache import cached_load
 from agent.llm import call_model
 
 
+# Placeholder for deliverables with no file in the phase directory
+_MISSING = object()
+
+# Mermaid header and edge tokens checked by _evaluate_flowchart
+_MERMAID_HEADER_RE = re.compile(r"\s*(?:flowchart|graph)")
+_MERMAID_EDGE_RE = re.compile(r"-->|---")
+
+
 class GateReviewAgent:
     """Evaluates deliverable completeness and readiness for phase transition."""
 
@@ -96,6 +111,18 @@ class GateReviewAgent:
         },
     }
 
+    # Gate results kept per agent, keyed on (deliverables_dir, phase, fingerprint)
+    SCORE_CACHE_SIZE = 128
+
+    # Deliverable name -> evaluator method name
+    _EVALUATORS = {
+        "sipoc": "_evaluate_sipoc",
+        "process_map": "_evaluate_process_map",
+        "baseline_metrics": "_evaluate_baseline_metrics",
+        "flowchart": "_evaluate_flowchart",
+        "exception_register": "_evaluate_exception_register",
+    }
+
     def __init__(self, projects_root: Optional[Path] = None):
         """Initialize the Gate Review Agent.
 
@@ -105,6 +132,8 @@ class GateReviewAgent:
         self.projects_root = Path(
             projects_root or (Path(__file__).parent.parent / "projects")
         )
+        self._score_cache: "OrderedDict[Tuple[str, str, Tuple[Tuple[str, int, int], ...]], Dict[str, Any]]" = OrderedDict()
+        self._score_cache_lock = threading.Lock()
 
     def evaluate_gate(self, project_id: str, phase: str = "standardization") -> Dict[str, Any]:
         """Evaluate whether a project is ready to pass the gate for a phase.
@@ -135,41 +164,113 @@ class GateReviewAgent:
         phase_dir = self.PHASE_DIRS.get(phase, f"1-{phase}")
         base_deliverables_path = project_path / "deliverables" / phase_dir
 
-        # Check en/ subdirectory first (new layout), fall back to phase root (legacy)
-        en_path = base_deliverables_path / "en"
-        deliverables_path = en_path if en_path.exists() else base_deliverables_path
+        # List the deliverables once: en/ subdirectory first (new layout),
+        # falling back to the phase root (legacy). The (name, mtime, size) of
+        # each deliverable file fingerprints the inputs for the score cache.
+        wanted = {f"{name}.json" for name in gate_criteria["deliverables"]}
+        deliverables_path = None
+        for candidate in (base_deliverables_path / "en", base_deliverables_path):
+            try:
+                with os.scandir(candidate) as it:
+                    fingerprint = tuple(sorted(
+                        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                        for entry in it
+                        if entry.name in wanted
+                    ))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            deliverables_path = candidate
+            break
 
-        if not deliverables_path.exists():
+        if deliverables_path is None:
             return {
                 "status": "error",
                 "message": "No deliverables found. Generate deliverables first.",
             }
 
+        # Reuse the last result for unchanged deliverable files
+        key = (str(deliverables_path), phase, fingerprint)
+        with self._score_cache_lock:
+            scored = self._score_cache.get(key)
+            if scored is not None:
+                self._score_cache.move_to_end(key)
+        if scored is None:
+            scored = self._score_deliverables(*key)
+            with self._score_cache_lock:
+                self._score_cache[key] = scored
+                while len(self._score_cache) > self.SCORE_CACHE_SIZE:
+                    self._score_cache.popitem(last=False)
+
+        # Copy so callers can't mutate the cached result
+        result = copy.deepcopy(scored)
+        result["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return result
+
+    def _score_deliverables(
+        self,
+        deliverables_dir: str,
+        phase: str,
+        fingerprint: Tuple[Tuple[str, int, int], ...],
+    ) -> Dict[str, Any]:
+        """Score a phase's deliverables and build the gate decision.
+
+        evaluate_gate caches the result per agent on (deliverables_dir, phase,
+        fingerprint), so repeated reviews of unchanged deliverable files skip
+        reading and scoring entirely.
+
+        Args:
+            deliverables_dir: Directory holding the deliverable JSON files
+            phase: The phase being evaluated
+            fingerprint: Sorted (filename, mtime_ns, size) of present deliverables
+
+        Returns:
+            Gate review result without the timestamp
+        """
+        gate_criteria = self.GATE_CRITERIA[phase]
+        deliverables_path = Path(deliverables_dir)
+        entries = {name for name, _, _ in fingerprint}
+
+        # Read the deliverables that exist in parallel; a failed read is kept
+        # as the exception so it is reported per deliverable below
+        def _load_one(deliverable_name: str):
+            deliverable_file = deliverables_path / f"{deliverable_name}.json"
+            if deliverable_file.name not in entries:
+                return deliverable_name, _MISSING
+            try:
+                return deliverable_name, cached_load(deliverable_file)
+            except Exception as e:
+                return deliverable_name, e
+
+        loaded = {}
+        if gate_criteria["deliverables"]:
+            with ThreadPoolExecutor(max_workers=len(gate_criteria["deliverables"])) as pool:
+                loaded = dict(pool.map(_load_one, gate_criteria["deliverables"]))
+
         # Evaluate each deliverable
         deliverable_scores = {}
-        feedback = []
+        feedback_records = []
         weighted_scores = []
 
         for deliverable_name, criteria in gate_criteria["deliverables"].items():
-            # Load deliverable JSON
-            deliverable_file = deliverables_path / f"{deliverable_name}.json"
+            pretty_name = deliverable_name.replace("_", " ").title()
+            deliverable_data = loaded[deliverable_name]
 
-            if not deliverable_file.exists():
+            if deliverable_data is _MISSING:
                 # Deliverable missing
                 deliverable_scores[deliverable_name] = {
                     "score": 0,
                     "weight": criteria["weight"],
                     "status": "MISSING",
-                    "feedback": f"{deliverable_name.replace('_', ' ').title()} not generated",
+                    "feedback": f"{pretty_name} not generated",
                 }
-                feedback.append(f"❌ {deliverable_name.replace('_', ' ').title()}: Not generated")
+                feedback_records.append(("MISSING", pretty_name, 0, None, ()))
                 weighted_scores.append(0)
                 continue
 
-            # Load and evaluate deliverable
+            # Evaluate deliverable
             try:
-                with open(deliverable_file, "r", encoding="utf-8") as f:
-                    deliverable_data = json.load(f)
+                if isinstance(deliverable_data, Exception):
+                    raise deliverable_data
 
                 score, issues = self._evaluate_deliverable(
                     deliverable_name=deliverable_name,
@@ -188,13 +289,11 @@ class GateReviewAgent:
                 weighted_score = (score * criteria["weight"]) / 100
                 weighted_scores.append(weighted_score)
 
-                # Add feedback
-                if score >= criteria["min_completeness"]:
-                    feedback.append(f"✅ {deliverable_name.replace('_', ' ').title()}: {score}%")
-                else:
-                    feedback.append(f"❌ {deliverable_name.replace('_', ' ').title()}: {score}% (need {criteria['min_completeness']}%)")
-                    for issue in issues:
-                        feedback.append(f"   • {issue}")
+                # Record feedback; strings are built once in _format_feedback
+                status = "PASS" if score >= criteria["min_completeness"] else "FAIL"
+                feedback_records.append(
+                    (status, pretty_name, score, criteria["min_completeness"], tuple(issues))
+                )
 
             except Exception as e:
                 deliverable_scores[deliverable_name] = {
@@ -203,7 +302,7 @@ class GateReviewAgent:
                     "status": "ERROR",
                     "feedback": f"Error reading deliverable: {str(e)}",
                 }
-                feedback.append(f"❌ {deliverable_name.replace('_', ' ').title()}: Error reading file")
+                feedback_records.append(("ERROR", pretty_name, 0, None, ()))
                 weighted_scores.append(0)
 
         # Calculate overall score
@@ -224,11 +323,25 @@ class GateReviewAgent:
             "threshold": threshold,
             "phase": phase,
             "deliverable_scores": deliverable_scores,
-            "feedback": feedback,
+            "feedback": self._format_feedback(feedback_records),
             "summary": summary,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
         }
 
+    def _format_feedback(self, feedback_records: List[Tuple[str, str, float, Optional[int], Tuple[str, ...]]]) -> List[str]:
+        """Render feedback lines from (status, name, score, min_required, issues) records."""
+        feedback = []
+        for status, name, score, min_required, issues in feedback_records:
+            if status == "MISSING":
+                feedback.append(f"❌ {name}: Not generated")
+            elif status == "ERROR":
+                feedback.append(f"❌ {name}: Error reading file")
+            elif status == "PASS":
+                feedback.append(f"✅ {name}: {score}%")
+            else:
+                feedback.append(f"❌ {name}: {score}% (need {min_required}%)")
+                feedback.extend(f"   • {issue}" for issue in issues)
+        return feedback
+
     def _evaluate_deliverable(
         self,
         deliverable_name: str,
@@ -245,21 +358,10 @@ class GateReviewAgent:
         Returns:
             Tuple of (score, issues_list)
         """
-        issues = []
-        required_fields = criteria.get("required_fields", [])
-
-        if deliverable_name == "sipoc":
-            return self._evaluate_sipoc(deliverable_data, required_fields)
-        elif deliverable_name == "process_map":
-            return self._evaluate_process_map(deliverable_data, required_fields)
-        elif deliverable_name == "baseline_metrics":
-            return self._evaluate_baseline_metrics(deliverable_data, required_fields)
-        elif deliverable_name == "flowchart":
-            return self._evaluate_flowchart(deliverable_data, required_fields)
-        elif deliverable_name == "exception_register":
-            return self._evaluate_exception_register(deliverable_data, required_fields)
-        else:
+        evaluator = getattr(self, self._EVALUATORS.get(deliverable_name, ""), None)
+        if evaluator is None:
             return 0.0, [f"Unknown deliverable type: {deliverable_name}"]
+        return evaluator(deliverable_data, criteria.get("required_fields", ()))
 
     def _evaluate_sipoc(self, data: Dict[str, Any], required_fields: List[str]) -> tuple[float, List[str]]:
         """Evaluate SIPOC deliverable."""
@@ -288,9 +390,13 @@ class GateReviewAgent:
             issues.append("No process steps defined")
             return 0.0, issues
 
-        # Check if steps have required attributes
-        steps_with_performers = sum(1 for step in steps if step.get("performer"))
-        steps_with_systems = sum(1 for step in steps if step.get("system"))
+        # Check if steps have required attributes (one pass over steps)
+        steps_with_performers = steps_with_systems = 0
+        for step in steps:
+            if step.get("performer"):
+                steps_with_performers += 1
+            if step.get("system"):
+                steps_with_systems += 1
 
         step_score = (len(steps) >= 3) * 40  # At least 3 steps
         performer_score = (steps_with_performers / len(steps)) * 30  # Performers present
@@ -315,15 +421,13 @@ class GateReviewAgent:
         # Check for metrics in each category
         for field in required_fields:
             category_metrics = data.get(field, {})
-            if isinstance(category_metrics, dict) and len(category_metrics) > 0:
-                # Check if metrics have actual values
-                has_values = any(v is not None and v != "" for v in category_metrics.values())
-                if has_values:
-                    present_count += 1
-                else:
-                    issues.append(f"{field.title()} metrics defined but no values")
-            else:
+            if not category_metrics or not isinstance(category_metrics, dict):
                 issues.append(f"Missing {field} metrics")
+            # Check if metrics have actual values (stops at the first one)
+            elif any(v is not None and v != "" for v in category_metrics.values()):
+                present_count += 1
+            else:
+                issues.append(f"{field.title()} metrics defined but no values")
 
         score = (present_count / len(required_fields)) * 100
         return score, issues
@@ -338,12 +442,12 @@ class GateReviewAgent:
             return 0.0, issues
 
         # Check for valid Mermaid syntax
-        if not diagram.strip().startswith("flowchart") and not diagram.strip().startswith("graph"):
+        if not _MERMAID_HEADER_RE.match(diagram):
             issues.append("Invalid Mermaid syntax (should start with 'flowchart' or 'graph')")
             return 50.0, issues
 
         # Check for multiple nodes
-        node_count = diagram.count("-->") + diagram.count("---")
+        node_count = len(_MERMAID_EDGE_RE.findall(diagram))
         if node_count < 2:
             issues.append("Flowchart has too few connections (need at least 2)")
             return 60.0, issues
@@ -355,15 +459,15 @@ class GateReviewAgent:
         issues = []
 
         exceptions = data.get("exceptions", [])
-        if not exceptions or len(exceptions) == 0:
+        if not exceptions:
             issues.append("No exceptions documented")
             return 0.0, issues
 
         # Check if exceptions have handling procedures
-        exceptions_with_handling = sum(
-            1 for exc in exceptions
-            if exc.get("handling") or exc.get("resolution")
-        )
+        exceptions_with_handling = 0
+        for exc in exceptions:
+            if exc.get("handling") or exc.get("resolution"):
+                exceptions_with_handling += 1
 
         score = (exceptions_with_handling / len(exceptions)) * 100
 
@@ -373,6 +477,12 @@ class GateReviewAgent:
         return score, issues
 
 
+# Freeze required field lists at import time; evaluators only iterate them
+for _phase_criteria in GateReviewAgent.GATE_CRITERIA.values():
+    for _criteria in _phase_criteria["deliverables"].values():
+        _criteria["required_fields"] = tuple(_criteria["required_fields"])
+
+
 if __name__ == "__main__":
     # Quick test
     gra = GateReviewAgent()
@@ -0,0 +1,112 @@
+"""Guard Cache - In-process LFU cache for LLM guard verdicts.
+
+Re-uploaded files and repeated chat phrases are classified by the paid
+guard LLM over and over. This cache keeps the most frequently seen
+verdicts keyed by a hash of the normalized input, so repeat checks skip
+the guard call entirely.
+
+Author: Security Enhancement
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def guard_cache_key(text: str) -> str:
+    """Build a cache key for guard input.
+
+    Lowercases and collapses whitespace before hashing, so trivially
+    reformatted copies of the same text share one verdict.
+
+    Args:
+        text: Raw input passed to the guard
+
+    Returns:
+        Hex digest identifying the normalized input
+    """
+    normalized = _WHITESPACE_RE.sub(" ", text.lower()).strip()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LFUCache:
+    """Thread-safe least-frequently-used cache.
+
+    Eviction removes the entry with the lowest hit count; among equally
+    used entries the least recently used one goes first. Entries are kept
+    in one insertion-ordered bucket per frequency so get/put stay O(1).
+    """
+
+    def __init__(self, capacity: int = 50_000):
+        """Initialize the cache.
+
+        Args:
+            capacity: Maximum number of entries kept
+        """
+        self.capacity = capacity
+        self._values: Dict[Hashable, Any] = {}
+        self._frequency: Counter = Counter()
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._min_frequency = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _touch(self, key: Hashable) -> None:
+        """Move key into the next frequency bucket."""
+        frequency = self._frequency[key]
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        self._frequency[key] = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            if key not in self._values:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(key)
+            return self._values[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least used entry if full."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            if key in self._values:
+                self._values[key] = value
+                self._touch(key)
+                return
+            if len(self._values) >= self.capacity:
+                bucket = self._buckets[self._min_frequency]
+                victim, _ = bucket.popitem(last=False)
+                if not bucket:
+                    del self._buckets[self._min_frequency]
+                del self._values[victim]
+                del self._frequency[victim]
+            self._values[key] = value
+            self._frequency[key] = 1
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_frequency = 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._values),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
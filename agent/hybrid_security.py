@@ -10,11 +10,20 @@ Author: Security Enhancement
 """
 
 import os
-from typing import Optional
+import re
+from typing import Optional, Tuple
 from pathlib import Path
 
-from agent.prompt_security import PromptInjectionDefense, SecurityCheck
-from agent.llm_guard import LLMGuard
+from agent.prompt_security import RISK_CODE, PromptInjectionDefense, SecurityCheck
+from agent.llm_guard import LLMGuard, is_degraded_verdict
+from agent.guard_cache import LFUCache, guard_cache_key
+
+
+_PUNCTUATION_TO_SPACE = str.maketrans(".,!?", "    ")
+
+_LOW = RISK_CODE["low"]
+_MEDIUM = RISK_CODE["medium"]
+_HIGH = RISK_CODE["high"]
 
 
 class HybridSecurityChecker:
@@ -29,6 +38,23 @@ class HybridSecurityChecker:
     Result: 80% of checks skip LLM (free), 20% use LLM (accurate).
     """
 
+    # Lowest regex risk code that still needs LLM confirmation, per threshold
+    # setting; anything up to HIGH is checked, CRITICAL never is
+    _MIN_CODE_BY_THRESHOLD = {
+        "low": RISK_CODE["low"],        # Check everything except critical and safe
+        "medium": RISK_CODE["medium"],  # Only check medium and high
+        "high": RISK_CODE["high"],      # Only check high risk
+    }
+
+    # Short acknowledgements ("ok", "yes please", "thanks!") that cannot
+    # match any injection or suspicious pattern and are passed without a scan
+    _FASTPATH_RE = re.compile(r"[A-Za-z .,!?']{1,32}")
+    _FASTPATH_WORDS = frozenset({
+        "ok", "okay", "yes", "yeah", "yep", "no", "nope", "sure", "thanks",
+        "thank", "you", "great", "good", "fine", "perfect", "correct", "right",
+        "done", "please", "agreed", "sounds", "got", "it", "s", "cool",
+    })
+
     def __init__(self, projects_root: Optional[Path] = None):
         """Initialize hybrid checker.
 
@@ -38,6 +64,13 @@ class HybridSecurityChecker:
         self.regex_defense = PromptInjectionDefense()
         self.llm_guard = LLMGuard(projects_root)
         self.use_llm_guard = self._should_use_llm_guard()
+        # Threshold is read once; it only changes with the process environment
+        self._threshold = os.environ.get("SECURITY_LLM_GUARD_THRESHOLD", "low").lower()
+        self._min_code = self._MIN_CODE_BY_THRESHOLD.get(
+            self._threshold, self._MIN_CODE_BY_THRESHOLD["low"]
+        )
+        self._guard_cache = LFUCache()
+        self.use_fastpath = os.environ.get("SECURITY_DISABLE_FASTPATH", "false").lower() != "true"
 
     def _should_use_llm_guard(self) -> bool:
         """Determine if LLM guard should be used based on configuration."""
@@ -68,6 +101,11 @@ class HybridSecurityChecker:
         Returns:
             SecurityCheck with combined assessment
         """
+        if not force_llm_check:
+            fastpath_check = self._fastpath_check(user_input)
+            if fastpath_check is not None:
+                return fastpath_check
+
         # Phase 1: Fast regex check (free, instant)
         regex_check = self.regex_defense.check_input(user_input, context)
 
@@ -82,14 +120,100 @@ class HybridSecurityChecker:
             return regex_check
 
         # Phase 2: LLM guard check (paid, slow, but accurate)
-        llm_classification, llm_details = self.llm_guard.check_safety(
-            user_input,
-            project_id
-        )
+        llm_classification, llm_details = self._guard_verdict(user_input, project_id)
 
         # Combine results
         return self._combine_results(regex_check, llm_classification, llm_details)
 
+    async def acheck_input(
+        self,
+        user_input: str,
+        project_id: str,
+        context: str = "user_message",
+        force_llm_check: bool = False
+    ) -> SecurityCheck:
+        """Awaitable variant of check_input.
+
+        The regex phase and the LLM decision run inline; only the guard
+        call is awaited, so concurrent checks overlap their LLM latency.
+
+        Args:
+            user_input: Text to validate
+            project_id: Project ID for cost logging
+            context: Where input came from (for logging)
+            force_llm_check: Always use LLM guard even if regex is safe
+
+        Returns:
+            SecurityCheck with combined assessment
+        """
+        if not force_llm_check:
+            fastpath_check = self._fastpath_check(user_input)
+            if fastpath_check is not None:
+                return fastpath_check
+
+        regex_check = self.regex_defense.check_input(user_input, context)
+
+        if not self._needs_llm_validation(regex_check, force_llm_check):
+            return regex_check
+
+        llm_classification, llm_details = await self._aguard_verdict(user_input, project_id)
+
+        return self._combine_results(regex_check, llm_classification, llm_details)
+
+    def _fastpath_check(self, user_input: str) -> Optional[SecurityCheck]:
+        """Return a SAFE verdict for short acknowledgements, else None.
+
+        Only inputs made entirely of allow-listed words and basic
+        punctuation qualify, so nothing a pattern could match is skipped.
+        Disabled with SECURITY_DISABLE_FASTPATH=true.
+        """
+        if not self.use_fastpath or not self._FASTPATH_RE.fullmatch(user_input):
+            return None
+        words = user_input.lower().replace("'", " ").translate(_PUNCTUATION_TO_SPACE).split()
+        if not words or not self._FASTPATH_WORDS.issuperset(words):
+            return None
+        return SecurityCheck(
+            is_safe=True,
+            risk_level="safe",
+            threats_detected=[],
+            sanitized_input=user_input,
+            check_method="fastpath"
+        )
+
+    def _guard_verdict(self, user_input: str, project_id: str) -> Tuple[str, dict]:
+        """Return the guard verdict for input, consulting the verdict cache."""
+        cache_key = guard_cache_key(user_input)
+        verdict = self._guard_cache.get(cache_key)
+        if verdict is None:
+            verdict = self.llm_guard.check_safety(user_input, project_id)
+            self._cache_verdict(cache_key, verdict)
+        return verdict
+
+    async def _aguard_verdict(self, user_input: str, project_id: str) -> Tuple[str, dict]:
+        """Awaitable variant of _guard_verdict."""
+        cache_key = guard_cache_key(user_input)
+        verdict = self._guard_cache.get(cache_key)
+        if verdict is None:
+            verdict = await self.llm_guard.acheck_safety(user_input, project_id)
+            self._cache_verdict(cache_key, verdict)
+        return verdict
+
+    def _cache_verdict(self, cache_key: str, verdict: tuple) -> None:
+        """Remember a guard verdict unless the guard call itself failed.
+
+        Errors, unparseable and mock responses fail closed as SUSPICIOUS;
+        caching them would keep returning that fallback after the provider
+        recovers.
+        """
+        _, details = verdict
+        if is_degraded_verdict(details):
+            return
+        self._guard_cache.put(cache_key, verdict)
+
+    def guard_cache_stats(self) -> dict:
+        """Return hit/miss statistics for the guard verdict cache."""
+        return self._guard_cache.stats()
+
     def _needs_llm_validation(
         self,
         regex_check: SecurityCheck,
@@ -112,34 +236,10 @@ class HybridSecurityChecker:
         if force_check:
             return True
 
-        # Get threshold setting
-        threshold = os.environ.get("SECURITY_LLM_GUARD_THRESHOLD", "low").lower()
-
-        risk_level = regex_check.risk_level
-
-        # If regex found CRITICAL threat, block immediately without LLM
-        # (save money on obvious attacks)
-        if risk_level == "critical":
-            return False
-
-        # If regex says completely SAFE, skip LLM
-        # (save money on clearly legitimate inputs)
-        if risk_level == "safe" and threshold in ["medium", "high"]:
-            return False
-
-        # Threshold-based decision
-        if threshold == "low":
-            # Check everything except critical and safe
-            return risk_level in ["low", "medium", "high"]
-        elif threshold == "medium":
-            # Only check medium and high
-            return risk_level in ["medium", "high"]
-        elif threshold == "high":
-            # Only check high risk
-            return risk_level == "high"
-        else:
-            # Default: check suspicious inputs
-            return risk_level in ["low", "medium", "high"]
+        # CRITICAL threats are blocked immediately without LLM (save money on
+        # obvious attacks) and SAFE inputs skip it (save money on clearly
+        # legitimate inputs); both fall outside the checked range.
+        return self._min_code <= regex_check.risk_code <= _HIGH
 
     def _combine_results(
         self,
@@ -161,33 +261,26 @@ class HybridSecurityChecker:
             Combined SecurityCheck
         """
         # Start with regex result
-        combined = SecurityCheck(
-            is_safe=regex_check.is_safe,
-            risk_level=regex_check.risk_level,
-            threats_detected=regex_check.threats_detected.copy(),
-            sanitized_input=regex_check.sanitized_input,
-            check_method="hybrid"
-        )
+        threats = list(regex_check.threats_detected)
+        is_safe = regex_check.is_safe
+        risk_level = regex_check.risk_level
 
         # Add LLM findings
         if llm_classification == "UNSAFE":
             # LLM says unsafe → upgrade to critical
-            combined.is_safe = False
-            combined.risk_level = "critical"
-            combined.threats_detected.append(
+            is_safe = False
+            risk_level = "critical"
+            threats.append(
                 f"LLM Guard: {llm_details.get('reason', 'Detected as unsafe')}"
             )
-            if llm_details.get('threats'):
-                combined.threats_detected.extend([
-                    f"LLM: {t}" for t in llm_details['threats']
-                ])
+            threats.extend(f"LLM: {t}" for t in llm_details.get('threats') or ())
 
         elif llm_classification == "SUSPICIOUS":
             # LLM says suspicious → upgrade to medium if currently low
-            if combined.risk_level in ["safe", "low"]:
-                combined.risk_level = "medium"
-                combined.is_safe = False  # Treat suspicious as not safe
-            combined.threats_detected.append(
+            if regex_check.risk_code <= _LOW:
+                risk_level = "medium"
+                is_safe = False  # Treat suspicious as not safe
+            threats.append(
                 f"LLM Guard (suspicious): {llm_details.get('reason', 'Requires caution')}"
             )
 
@@ -196,20 +289,26 @@ class HybridSecurityChecker:
             llm_confidence = llm_details.get('confidence', 0.0)
 
             # If LLM is very confident (>0.9) it's safe, and regex only found low-level threats
-            if llm_confidence > 0.9 and combined.risk_level in ["low", "medium"]:
-                combined.risk_level = "safe"
-                combined.is_safe = True
-                combined.threats_detected.append(
+            if llm_confidence > 0.9 and _LOW <= regex_check.risk_code <= _MEDIUM:
+                risk_level = "safe"
+                is_safe = True
+                threats.append(
                     f"LLM Guard: Confirmed safe (confidence: {llm_confidence:.2f})"
                 )
 
         # Add LLM metadata
-        combined.threats_detected.append(
+        threats.append(
             f"Guard model: {llm_details.get('guard_model', 'unknown')}, "
             f"Cost: ${llm_details.get('guard_cost_usd', 0):.4f}"
         )
 
-        return combined
+        return SecurityCheck(
+            is_safe=is_safe,
+            risk_level=risk_level,
+            threats_detected=threats,
+            sanitized_input=regex_check.sanitized_input,
+            check_method="hybrid"
+        )
 
     def create_safe_prompt(
         self,
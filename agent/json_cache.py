@@ -0,0 +1,73 @@
+"""JSON Cache - Reuse parsed JSON files until they change.
+
+Agents re-read the same knowledge base and deliverable files on every
+run. cached_load() keeps the most recently used parses keyed by path and
+reuses one while the file's (mtime_ns, size) is unchanged. Callers share
+the cached object, so treat it as read-only; a caller that needs to modify
+the data must copy.deepcopy() it first.
+
+Set JSON_CACHE_MAX to bound the number of files kept (default 128).
+
+Usage:
+    from agent.json_cache import cached_load
+
+    knowledge_base = cached_load(kb_path)
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Tuple
+
+try:
+    import orjson  # optional: faster JSON parsing
+
+    def _load_json(path: Path) -> Any:
+        """Parse a JSON file with orjson."""
+        return orjson.loads(path.read_bytes())
+except ImportError:
+    def _load_json(path: Path) -> Any:
+        """Parse a JSON file with the standard library."""
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+JSON_CACHE_MAX = int(os.environ.get("JSON_CACHE_MAX", "128"))
+
+# Parsed JSON files keyed by path, least recently used first
+_JSON_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+_JSON_CACHE_LOCK = threading.Lock()
+
+
+def cached_load(path: Path) -> Any:
+    """Load a JSON file, reusing the previous parse if the file has not changed.
+
+    Args:
+        path: JSON file to load
+
+    Returns:
+        The parsed data, shared with other callers; do not modify it
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON
+    """
+    path = Path(path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = str(path)
+    with _JSON_CACHE_LOCK:
+        cached = _JSON_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            _JSON_CACHE.move_to_end(key)
+            return cached[1]
+    data = _load_json(path)
+    if JSON_CACHE_MAX > 0:
+        with _JSON_CACHE_LOCK:
+            _JSON_CACHE[key] = (stamp, data)
+            _JSON_CACHE.move_to_end(key)
+            while len(_JSON_CACHE) > JSON_CACHE_MAX:
+                _JSON_CACHE.popitem(last=False)
+    return data
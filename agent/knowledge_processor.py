@@ -5,7 +5,7 @@ This agent:
 2. Reads each file (PDF, DOCX, TXT, images, etc.)
 3. Uses the LLM to extract structured information
 4. Consolidates findings into knowledge_base.json
-5. Logs analysis per source in analysis_log.json
+5. Logs analysis per source in analysis_log.jsonl
 
 The agent is knowledge-first: it learns everything available before
 any conversation happens, giving subsequent agents a complete picture
@@ -22,17 +22,290 @@ Usage:
     print(f"Analyzed {len(knowledge_base.get('sources', []))} sources")
 """
 
+import asyncio
+import hashlib
 import json
+import mmap
+import multiprocessing
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import mimetypes
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from agent.llm import call_model
+from agent.llm import call_model_async, model_for_agent
 from agent.validators import validate_project_id
 from agent.hybrid_security import HybridSecurityChecker
+from agent.prompt_security import SecurityCheck
 from agent.security_logger import SecurityLogger
+from agent.extraction_cache import ExtractionCache, extraction_cache_key
+
+# Workers per processing pipeline stage. Each stage is bounded on its own,
+# so up to READ + SCREEN + EXTRACT files can be in flight at once; the two
+# LLM stages default to 4 each so at most 8 model calls overlap.
+READ_CONCURRENCY = int(os.environ.get("READ_CONCURRENCY", "8"))
+SCREEN_CONCURRENCY = int(os.environ.get("SCREEN_CONCURRENCY", "4"))
+EXTRACT_CONCURRENCY = int(os.environ.get("EXTRACT_CONCURRENCY", "4"))
+
+# Items buffered between processing pipeline stages (bounds memory held
+# in file contents waiting for a guard or extraction call)
+PIPELINE_QUEUE_SIZE = 16
+
+# Characters of file content sent to the extraction prompt
+MAX_EXTRACTION_CHARS = 50000
+
+# Bytes read from plain-text files; UTF-8 needs at most 4 bytes per
+# character, and one extra character marks the content as truncated
+MAX_TEXT_READ_BYTES = 4 * (MAX_EXTRACTION_CHARS + 1)
+
+
+def _read_docx(file_path: Path, max_chars: int = MAX_EXTRACTION_CHARS) -> Optional[str]:
+    """Extract paragraph text from a Word document.
+
+    Stops once more than max_chars have been collected; the extra
+    characters let callers tell that the text was cut short.
+    """
+    try:
+        from docx import Document
+        doc = Document(file_path)
+        chunks = []
+        total = 0
+        for para in doc.paragraphs:
+            chunks.append(para.text)
+            total += len(para.text) + 1
+            if total > max_chars:
+                break
+        return "\n".join(chunks)
+    except Exception:
+        return None
+
+
+def _read_pdf(file_path: Path, max_chars: int = MAX_EXTRACTION_CHARS) -> Optional[str]:
+    """Extract text from a PDF page by page.
+
+    Stops once more than max_chars have been collected, so large PDFs are
+    never fully materialised only to be truncated by the prompt builder.
+    """
+    try:
+        import PyPDF2
+        with open(file_path, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            chunks = []
+            total = 0
+            for page in reader.pages:
+                text = page.extract_text() or ""
+                chunks.append(text)
+                total += len(text)
+                if total > max_chars:
+                    break
+            return "".join(chunks)
+    except Exception:
+        return None
+
+
+def _read_image_ocr(file_path: Path) -> Optional[str]:
+    """OCR an image if available, otherwise return a placeholder."""
+    try:
+        from PIL import Image
+        import pytesseract
+        img = Image.open(file_path)
+        return pytesseract.image_to_string(img)
+    except Exception:
+        # OCR not available; return placeholder
+        return f"[Image file: {file_path.name}]"
+
+
+# Readers for formats whose parsing is CPU-bound. They are module-level so
+# they can be pickled into the process pool.
+_DOCUMENT_READERS = {
+    ".docx": _read_docx,
+    ".doc": _read_docx,
+    ".pdf": _read_pdf,
+    ".png": _read_image_ocr,
+    ".jpg": _read_image_ocr,
+    ".jpeg": _read_image_ocr,
+    ".gif": _read_image_ocr,
+    ".bmp": _read_image_ocr,
+}
+
+try:
+    import orjson  # optional: faster JSON parsing and serialization
+
+    _loads_json = orjson.loads
+
+    def _load_json(path: Path) -> Any:
+        """Parse a JSON file with orjson."""
+        return orjson.loads(path.read_bytes())
+
+    def _dump_json(data: Any, indent: bool = True) -> str:
+        """Serialize data with orjson, falling back for values it rejects."""
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, option=option).decode("utf-8")
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return json.dumps(data, indent=2 if indent else None, ensure_ascii=False)
+except ImportError:
+    _loads_json = json.loads
+
+    def _load_json(path: Path) -> Any:
+        """Parse a JSON file with the standard library."""
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _dump_json(data: Any, indent: bool = True) -> str:
+        """Serialize data with the standard library."""
+        return json.dumps(data, indent=2 if indent else None, ensure_ascii=False)
+
+
+# Bump when the extraction JSON schema below changes, so extractions
+# cached under the old schema are no longer reused
+EXTRACTION_SCHEMA_VERSION = 1
+
+# Fixed extraction instructions, sent as the system prompt ahead of the
+# per-file content so the prefix is identical across calls
+_EXTRACTION_SYSTEM_PROMPT = """You are analyzing a process documentation file to extract ALL relevant information.
+
+CRITICAL INSTRUCTIONS:
+1. **EXTRACT EVERYTHING** - Do not skip tables, labeled fields, or structured data
+2. **PROCESS OWNER** - If there's a field/cell labeled "process owner", "owner", or similar, extract the name!
+3. **TEAMS & ROLES** - Extract all team names, roles, and responsibilities mentioned
+4. **SIPOC ELEMENTS** - Specifically look for:
+   - Suppliers: Who provides information/materials to start the process?
+   - Inputs: What information/materials are needed?
+   - Outputs: What is produced/delivered?
+   - Customers: Who receives the outputs?
+5. **PROCESS STEPS** - Extract each step with:
+   - Step name/description
+   - Who performs it (performer/role)
+   - What systems are used
+   - Any decisions or branching logic
+6. **METRICS** - Extract numbers, measurements, volumes, times, costs
+7. **TABLES** - Extract data from tables row by row with labels
+8. **EXCEPTIONS** - Any special cases, errors, or edge cases mentioned
+
+Extract and return ONLY a valid JSON object (no markdown, no code block) with this exact schema:
+{
+  "facts": [
+    {"category": "process_owner", "fact": "Owner name: [SPECIFIC NAME FROM DOCUMENT]", "confidence": 1.0},
+    {"category": "suppliers", "fact": "[WHO] provides [WHAT]", "confidence": 0.9},
+    {"category": "inputs", "fact": "[SPECIFIC INPUT] from [SOURCE]", "confidence": 0.9},
+    {"category": "outputs", "fact": "[SPECIFIC OUTPUT] to [DESTINATION]", "confidence": 0.9},
+    {"category": "customers", "fact": "[WHO] receives [WHAT]", "confidence": 0.9},
+    {"category": "process_steps", "fact": "Step X: [ACTION] by [PERFORMER] using [SYSTEM]", "confidence": 0.8},
+    {"category": "teams", "fact": "[TEAM NAME]: [RESPONSIBILITY]", "confidence": 0.9},
+    {"category": "systems", "fact": "[SYSTEM NAME]", "confidence": 0.9},
+    {"category": "metrics", "fact": "[METRIC NAME]: [VALUE] [UNIT]", "confidence": 0.8},
+    {"category": "decisions", "fact": "Decision: [CONDITION] then [ACTION]", "confidence": 0.7},
+    {"category": "constraints", "fact": "[CONSTRAINT DESCRIPTION]", "confidence": 0.7}
+  ],
+  "sources": [
+    {"system": "[SYSTEM/TEAM NAME]", "description": "[WHAT THEY DO]"}
+  ],
+  "exceptions": ["[EXCEPTION CASE]"],
+  "unknowns": ["[WHAT'S UNCLEAR]"]
+}
+
+IMPORTANT:
+- Be SPECIFIC - extract actual names, values, and details from the document
+- Don't skip tables or structured data!
+- If you see a labeled field (like "Process Owner: John Smith"), extract it!
+- Extract team names mentioned anywhere in the document
+- Return ONLY the JSON object, no other text.
+"""
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _file_sha(file_path: Path) -> str:
+    """Hash a file's bytes to recognise re-uploads under another name.
+
+    Reads in 1 MB chunks, so memory stays flat regardless of file size.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_text_head(file_path: Path, max_bytes: int = MAX_TEXT_READ_BYTES) -> str:
+    """Decode at most max_bytes from the start of a text file.
+
+    The file is memory-mapped, so only the pages actually sliced are read
+    from disk; large logs are never loaded whole.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:max_bytes].decode("utf-8", "ignore")
+
+
+# Marks the end of a pipeline stage's input, one per worker
+_STAGE_DONE = object()
+
+
+async def _run_stage(
+    handler: Callable[[tuple], Awaitable[None]],
+    in_queue: asyncio.Queue,
+    out_queue: Optional[asyncio.Queue],
+    results: List[Any],
+    workers: int,
+    downstream_workers: int = 0,
+) -> None:
+    """Run handler over a pipeline queue with a fixed pool of workers.
+
+    Items are tuples whose first element is the file's index; a handler
+    failure is stored in results at that index instead of stopping the
+    pipeline. The input queue must end with one end marker per worker;
+    once every worker has drained its input, one end marker per downstream
+    worker is passed on.
+    """
+    async def worker():
+        while (item := await in_queue.get()) is not _STAGE_DONE:
+            try:
+                await handler(item)
+            except Exception as e:
+                results[item[0]] = e
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if out_queue is not None:
+        for _ in range(downstream_workers):
+            await out_queue.put(_STAGE_DONE)
+
+
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared document-parsing pool, creating it on first use.
+
+    Workers are spawned rather than forked: the web server is
+    multi-threaded, and a forked child can inherit locks held by other
+    threads and deadlock.
+    """
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PROCESS_POOL
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next _get_process_pool() builds a new one."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is pool:
+            _PROCESS_POOL = None
+    pool.shutdown(wait=False)
 
 
 class KnowledgeProcessor:
@@ -48,12 +321,28 @@ class KnowledgeProcessor:
         self.projects_root = Path(projects_root or (Path(__file__).parent.parent / "projects"))
         self.security_checker = HybridSecurityChecker(self.projects_root)
         self.security_logger = SecurityLogger(self.projects_root)
+        self.extraction_cache = ExtractionCache(self.projects_root)
 
     def process_project(self, project_id: str) -> Dict[str, Any]:
         """Process all uploaded files for a project.
 
         Scans knowledge/uploaded/, reads each file, extracts structured
-        information, and updates knowledge_base.json and analysis_log.json.
+        information, and updates knowledge_base.json and analysis_log.jsonl.
+
+        Args:
+            project_id: The project ID to process
+
+        Returns:
+            Dictionary with keys: knowledge_base, analysis_log, status
+        """
+        return asyncio.run(self.aprocess_project(project_id))
+
+    async def aprocess_project(self, project_id: str) -> Dict[str, Any]:
+        """Awaitable variant of process_project.
+
+        Files are processed concurrently (READ_CONCURRENCY, SCREEN_CONCURRENCY
+        and EXTRACT_CONCURRENCY workers per stage) and merged in directory
+        order once all of them have finished.
 
         Args:
             project_id: The project ID to process
@@ -70,6 +359,9 @@ class KnowledgeProcessor:
                 "error": f"Invalid project ID '{project_id}'. Must contain only lowercase letters, numbers, and hyphens.",
             }
 
+        # One timestamp for the whole batch (UTC, second precision)
+        now_iso = datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
         project_path = self.projects_root / project_id
         uploaded_path = project_path / "knowledge" / "uploaded"
         extracted_path = project_path / "knowledge" / "extracted"
@@ -86,36 +378,100 @@ class KnowledgeProcessor:
         # Load existing knowledge base and analysis log
         knowledge_base = self._load_knowledge_base(extracted_path)
         analysis_log = self._load_analysis_log(extracted_path)
-
-        # Find files that haven't been processed
-        processed_files = {entry.get("source_file") for entry in analysis_log}
+        previous_log_length = len(analysis_log)
+
+        # Index existing facts and sources so new ones are deduplicated on
+        # insertion instead of re-scanning the whole knowledge base
+        fact_index = self._index_facts(knowledge_base.get("facts", []))
+        source_index = self._index_sources(knowledge_base.get("sources", []))
+
+        # Find files that haven't been processed (failed ones are retried)
+        processed_files = {
+            entry.get("source_file")
+            for entry in analysis_log
+            if entry.get("status") != "error"
+        }
         files_to_process = [
             f
             for f in uploaded_path.iterdir()
             if f.is_file() and f.name not in processed_files
         ]
 
-        # Process each new file
-        for file_path in files_to_process:
+        # Content already extracted successfully (e.g. a renamed re-upload)
+        # reuses the earlier analysis without another security check or LLM call
+        prior_by_sha = {
+            entry["content_sha"]: entry
+            for entry in analysis_log
+            if entry.get("status") == "success" and entry.get("content_sha")
+        }
+
+        # Stream files through read -> screen -> extract stages joined by
+        # bounded queues, so disk reads, guard calls and extraction calls
+        # overlap; results are merged in directory order afterwards
+        results: List[Any] = [None] * len(files_to_process)
+        read_queue: asyncio.Queue = asyncio.Queue()
+        screen_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        extract_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        for item in enumerate(files_to_process):
+            read_queue.put_nowait(item)
+        read_workers = max(1, READ_CONCURRENCY)
+        screen_workers = max(1, SCREEN_CONCURRENCY)
+        extract_workers = max(1, EXTRACT_CONCURRENCY)
+        for _ in range(read_workers):
+            read_queue.put_nowait(_STAGE_DONE)
+
+        async def read(item):
+            i, file_path = item
+            content = await self._aread_file(file_path)
+            if not content:
+                return
             try:
-                analysis = self._process_file(
-                    project_id, file_path, uploaded_path
-                )
+                content_sha = await asyncio.to_thread(_file_sha, file_path)
+            except OSError:
+                content_sha = None
+            prior = prior_by_sha.get(content_sha)
+            if prior is not None:
+                results[i] = self._reuse_analysis(prior, file_path, now_iso)
+                return
+            await screen_queue.put((i, file_path, content, content_sha))
+
+        async def screen(item):
+            i, file_path, content, content_sha = item
+            # SECURITY: Check file content for injection attempts (limit check to first 5000 chars for performance)
+            security_check = await self.security_checker.acheck_input(
+                user_input=content[:5000],
+                project_id=project_id,
+                context="file_upload"
+            )
+            await extract_queue.put((i, file_path, content, content_sha, security_check))
+
+        async def extract(item):
+            i, file_path, content, content_sha, security_check = item
+            results[i] = await self._aprocess_file(
+                project_id, file_path, content, content_sha, security_check, now_iso
+            )
+
+        await asyncio.gather(
+            _run_stage(read, read_queue, screen_queue, results, read_workers, screen_workers),
+            _run_stage(screen, screen_queue, extract_queue, results, screen_workers, extract_workers),
+            _run_stage(extract, extract_queue, None, results, extract_workers),
+        )
+
+        for file_path, analysis in zip(files_to_process, results):
+            try:
+                if isinstance(analysis, Exception):
+                    raise analysis
                 if analysis:
                     analysis_log.append(analysis)
                     # Merge extracted facts and sources
                     if "facts" in analysis.get("extraction", {}):
-                        knowledge_base.setdefault("facts", []).extend(
-                            analysis["extraction"]["facts"]
-                        )
+                        self._index_facts(analysis["extraction"]["facts"], fact_index)
                     if "sources" in analysis.get("extraction", {}):
-                        knowledge_base.setdefault("sources", []).extend(
-                            analysis["extraction"]["sources"]
-                        )
+                        self._index_sources(analysis["extraction"]["sources"], source_index)
             except Exception as e:
                 # Log error but continue processing
                 analysis_log.append({
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "timestamp": now_iso,
                     "source_file": file_path.name,
                     "file_type": file_path.suffix,
                     "status": "error",
@@ -123,18 +479,13 @@ class KnowledgeProcessor:
                     "extraction": {},
                 })
 
-        # Deduplicate facts and sources
-        knowledge_base["facts"] = self._deduplicate_facts(
-            knowledge_base.get("facts", [])
-        )
-        knowledge_base["sources"] = self._deduplicate_sources(
-            knowledge_base.get("sources", [])
-        )
-        knowledge_base["last_updated"] = datetime.utcnow().isoformat() + "Z"
+        knowledge_base["facts"] = list(fact_index.values())
+        knowledge_base["sources"] = list(source_index.values())
+        knowledge_base["last_updated"] = now_iso
 
         # Save updated files
         self._save_knowledge_base(extracted_path, knowledge_base)
-        self._save_analysis_log(extracted_path, analysis_log)
+        self._save_analysis_log(extracted_path, analysis_log[previous_log_length:])
 
         return {
             "knowledge_base": knowledge_base,
@@ -143,27 +494,25 @@ class KnowledgeProcessor:
             "files_processed": len(files_to_process),
         }
 
-    def _process_file(
-        self, project_id: str, file_path: Path, uploaded_path: Path
+    async def _aprocess_file(
+        self,
+        project_id: str,
+        file_path: Path,
+        file_content: Optional[str],
+        content_sha: Optional[str],
+        security_check: SecurityCheck,
+        now_iso: str,
     ) -> Optional[Dict[str, Any]]:
         """Process a single uploaded file.
 
-        Reads the file, calls the LLM to extract information,
-        and returns an analysis entry.
+        Extraction stage of the aprocess_project pipeline: takes the file's
+        content and its security verdict, awaits the LLM extraction, and
+        returns an analysis entry. Other files keep moving through the
+        read and screening stages meanwhile.
         """
-        # Read file content
-        file_content = self._read_file(file_path)
         if not file_content:
             return None
 
-        # SECURITY: Check file content for injection attempts (limit check to first 5000 chars for performance)
-        content_preview = file_content[:5000]
-        security_check = self.security_checker.check_input(
-            user_input=content_preview,
-            project_id=project_id,
-            context="file_upload"
-        )
-
         # Log if suspicious
         if not security_check.is_safe:
             self.security_logger.log_event(
@@ -183,7 +532,7 @@ class KnowledgeProcessor:
         # Block critical threats in uploaded files
         if security_check.risk_level == "critical":
             return {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now_iso,
                 "source_file": file_path.name,
                 "file_type": file_path.suffix,
                 "status": "blocked",
@@ -196,25 +545,68 @@ class KnowledgeProcessor:
         if not file_type:
             file_type = mimetypes.guess_extension(file_path.name) or "unknown"
 
+        # Identical content extracted in any project with the same model,
+        # prompt and schema is reused as-is
+        cache_key = None
+        cached_extraction = None
+        if content_sha:
+            cache_key = extraction_cache_key(
+                content_sha,
+                model_for_agent("knowledge_processor"),
+                _EXTRACTION_SYSTEM_PROMPT,
+                EXTRACTION_SCHEMA_VERSION,
+            )
+            cached_extraction = await asyncio.to_thread(self.extraction_cache.get, cache_key)
+        if cached_extraction is not None:
+            return {
+                "timestamp": now_iso,
+                "source_file": file_path.name,
+                "file_type": file_type,
+                "file_size_bytes": file_path.stat().st_size,
+                "content_sha": content_sha,
+                "status": "success",
+                "extraction_cached": True,
+                "model": None,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost_usd": 0.0,
+                "extraction": cached_extraction,
+            }
+
         # Build extraction prompt
         prompt = self._build_extraction_prompt(file_path.name, file_content, file_type)
 
         # Call LLM to extract information
-        result = call_model(
+        result = await call_model_async(
             project_id=project_id,
             agent="knowledge_processor",
             prompt=prompt,
+            system_prompt=_EXTRACTION_SYSTEM_PROMPT,
+            use_cache=True,
         )
+        if result.get("error"):
+            # Logged as an error entry, so the file is retried on the next run
+            raise RuntimeError(result["error"])
 
         # Parse extracted information
         text = result.get("text", "")
         extraction = self._parse_extraction(text)
+        # Only cache real extractions that yielded something; an empty result
+        # may be a parse failure worth retrying, and a dry-run mock is not
+        # an extraction at all
+        if (
+            cache_key
+            and result.get("source") != "mock"
+            and (extraction.get("facts") or extraction.get("sources"))
+        ):
+            await asyncio.to_thread(self.extraction_cache.put, cache_key, extraction)
 
         return {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": now_iso,
             "source_file": file_path.name,
             "file_type": file_type,
             "file_size_bytes": file_path.stat().st_size,
+            "content_sha": content_sha,
             "status": "success",
             "model": result.get("model"),
             "input_tokens": result.get("input_tokens", 0),
@@ -223,15 +615,56 @@ class KnowledgeProcessor:
             "extraction": extraction,
         }
 
+    async def _aread_file(self, file_path: Path) -> Optional[str]:
+        """Read file content without blocking the event loop.
+
+        CPU-heavy document parsing (PDF, DOCX, OCR) runs in the shared
+        process pool; plain-text reads stay in a worker thread, where the
+        IPC round trip would cost more than the read itself.
+        """
+        reader = _DOCUMENT_READERS.get(file_path.suffix.lower())
+        if reader is None:
+            return await asyncio.to_thread(self._read_file, file_path)
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool()
+        try:
+            return await loop.run_in_executor(pool, reader, file_path)
+        except BrokenProcessPool:
+            # A worker died; replace the pool for later files
+            _discard_process_pool(pool)
+        except Exception:
+            # Unpicklable result or similar; parse in-process instead
+            pass
+        return await asyncio.to_thread(self._read_file, file_path)
+
+    def _reuse_analysis(
+        self, prior: Dict[str, Any], file_path: Path, now_iso: str
+    ) -> Dict[str, Any]:
+        """Build an analysis entry for a file whose content was already extracted.
+
+        Copies the earlier entry's extraction; no model call is made, so the
+        token and cost fields are zeroed.
+        """
+        entry = dict(prior)
+        entry.update({
+            "timestamp": now_iso,
+            "source_file": file_path.name,
+            "file_size_bytes": file_path.stat().st_size,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cost_usd": 0.0,
+            "reused_from": prior.get("source_file"),
+        })
+        return entry
+
     def _read_file(self, file_path: Path) -> Optional[str]:
         """Read file content based on type."""
         try:
             suffix = file_path.suffix.lower()
 
-            # Plain text files
+            # Plain text files (only the head reaches the prompt)
             if suffix in {".txt", ".md", ".log"}:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    return f.read()
+                return _read_text_head(file_path)
 
             # JSON files
             elif suffix == ".json":
@@ -241,46 +674,15 @@ class KnowledgeProcessor:
 
             # CSV (simple read as text)
             elif suffix == ".csv":
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    return f.read()
-
-            # DOCX (basic extraction)
-            elif suffix in {".docx", ".doc"}:
-                try:
-                    from docx import Document
-                    doc = Document(file_path)
-                    return "\n".join([para.text for para in doc.paragraphs])
-                except Exception:
-                    return None
-
-            # PDF (basic text extraction)
-            elif suffix == ".pdf":
-                try:
-                    import PyPDF2
-                    with open(file_path, "rb") as f:
-                        reader = PyPDF2.PdfReader(f)
-                        text = ""
-                        for page in reader.pages:
-                            text += page.extract_text()
-                        return text
-                except Exception:
-                    return None
-
-            # Images (OCR if available, otherwise skip)
-            elif suffix in {".png", ".jpg", ".jpeg", ".gif", ".bmp"}:
-                try:
-                    from PIL import Image
-                    import pytesseract
-                    img = Image.open(file_path)
-                    return pytesseract.image_to_string(img)
-                except Exception:
-                    # OCR not available; return placeholder
-                    return f"[Image file: {file_path.name}]"
+                return _read_text_head(file_path)
+
+            # DOCX, PDF and images are parsed by module-level readers
+            elif suffix in _DOCUMENT_READERS:
+                return _DOCUMENT_READERS[suffix](file_path)
 
             else:
                 # Unknown file type; try as text
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    return f.read()
+                return _read_text_head(file_path)
 
         except Exception:
             return None
@@ -288,80 +690,50 @@ class KnowledgeProcessor:
     def _build_extraction_prompt(
         self, filename: str, content: str, file_type: str
     ) -> str:
-        """Build a prompt for the LLM to extract structured information."""
+        """Build the per-file part of the extraction prompt.
+
+        The fixed instructions live in _EXTRACTION_SYSTEM_PROMPT and are sent
+        as the system prompt, so every request shares a byte-identical
+        prefix that providers can serve from their prompt cache.
+        """
         # Increased from 4000 to 50000 chars to capture more content
         # This allows ~12,500 tokens, suitable for gpt-4o
-        truncated_content = content[:50000]
-
-        return f"""You are analyzing a process documentation file to extract ALL relevant information.
+        truncated_content = content[:MAX_EXTRACTION_CHARS]
 
-File: {filename}
+        return f"""File: {filename}
 Type: {file_type}
 
 Content:
 {truncated_content}
 
-{"..." if len(content) > 50000 else ""}
-
-CRITICAL INSTRUCTIONS:
-1. **EXTRACT EVERYTHING** - Do not skip tables, labeled fields, or structured data
-2. **PROCESS OWNER** - If there's a field/cell labeled "process owner", "owner", or similar, extract the name!
-3. **TEAMS & ROLES** - Extract all team names, roles, and responsibilities mentioned
-4. **SIPOC ELEMENTS** - Specifically look for:
-   - Suppliers: Who provides information/materials to start the process?
-   - Inputs: What information/materials are needed?
-   - Outputs: What is produced/delivered?
-   - Customers: Who receives the outputs?
-5. **PROCESS STEPS** - Extract each step with:
-   - Step name/description
-   - Who performs it (performer/role)
-   - What systems are used
-   - Any decisions or branching logic
-6. **METRICS** - Extract numbers, measurements, volumes, times, costs
-7. **TABLES** - Extract data from tables row by row with labels
-8. **EXCEPTIONS** - Any special cases, errors, or edge cases mentioned
-
-Extract and return ONLY a valid JSON object (no markdown, no code block) with this exact schema:
-{{
-  "facts": [
-    {{"category": "process_owner", "fact": "Owner name: [SPECIFIC NAME FROM DOCUMENT]", "confidence": 1.0}},
-    {{"category": "suppliers", "fact": "[WHO] provides [WHAT]", "confidence": 0.9}},
-    {{"category": "inputs", "fact": "[SPECIFIC INPUT] from [SOURCE]", "confidence": 0.9}},
-    {{"category": "outputs", "fact": "[SPECIFIC OUTPUT] to [DESTINATION]", "confidence": 0.9}},
-    {{"category": "customers", "fact": "[WHO] receives [WHAT]", "confidence": 0.9}},
-    {{"category": "process_steps", "fact": "Step X: [ACTION] by [PERFORMER] using [SYSTEM]", "confidence": 0.8}},
-    {{"category": "teams", "fact": "[TEAM NAME]: [RESPONSIBILITY]", "confidence": 0.9}},
-    {{"category": "systems", "fact": "[SYSTEM NAME]", "confidence": 0.9}},
-    {{"category": "metrics", "fact": "[METRIC NAME]: [VALUE] [UNIT]", "confidence": 0.8}},
-    {{"category": "decisions", "fact": "Decision: [CONDITION] then [ACTION]", "confidence": 0.7}},
-    {{"category": "constraints", "fact": "[CONSTRAINT DESCRIPTION]", "confidence": 0.7}}
-  ],
-  "sources": [
-    {{"system": "[SYSTEM/TEAM NAME]", "description": "[WHAT THEY DO]"}}
-  ],
-  "exceptions": ["[EXCEPTION CASE]"],
-  "unknowns": ["[WHAT'S UNCLEAR]"]
-}}
-
-IMPORTANT:
-- Be SPECIFIC - extract actual names, values, and details from the document
-- Don't skip tables or structured data!
-- If you see a labeled field (like "Process Owner: John Smith"), extract it!
-- Extract team names mentioned anywhere in the document
-- Return ONLY the JSON object, no other text.
+{"..." if len(content) > MAX_EXTRACTION_CHARS else ""}
 """
 
     def _parse_extraction(self, text: str) -> Dict[str, Any]:
-        """Parse the LLM response as JSON extraction."""
-        try:
-            # Try to extract JSON from the response
-            start = text.find("{")
-            end = text.rfind("}") + 1
-            if start >= 0 and end > start:
-                json_str = text[start:end]
-                return json.loads(json_str)
-        except (json.JSONDecodeError, ValueError):
-            pass
+        """Parse the LLM response as JSON extraction.
+
+        Decodes the first complete JSON object in the response that has a
+        "facts" list, so prose or code fences around it (or a trailing brace
+        in the prose) don't discard an otherwise valid extraction, and other
+        JSON in the response (e.g. an echoed .json source file) is skipped.
+        """
+        text = text.strip()
+        if text.startswith("```"):
+            text = text[3:]
+            if text[:4].lower() == "json":
+                text = text[4:]
+
+        start = text.find("{")
+        while start != -1:
+            try:
+                candidate, end = _JSON_DECODER.raw_decode(text, start)
+            except json.JSONDecodeError:
+                start = text.find("{", start + 1)
+                continue
+            if isinstance(candidate, dict) and isinstance(candidate.get("facts"), list):
+                return candidate
+            # Not an extraction; skip the whole object, nested ones included
+            start = text.find("{", end)
 
         # Fallback: return empty extraction
         return {
@@ -371,51 +743,75 @@ IMPORTANT:
             "unknowns": [],
         }
 
-    def _deduplicate_facts(self, facts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate facts based on category + fact text."""
-        seen = set()
-        unique = []
+    def _index_facts(
+        self,
+        facts: List[Dict[str, Any]],
+        index: Optional[Dict[tuple, Dict[str, Any]]] = None,
+    ) -> Dict[tuple, Dict[str, Any]]:
+        """Add facts to an index keyed on category + fact text.
+
+        The first occurrence of a key wins, and the dict keeps insertion
+        order, so list(index.values()) is the deduplicated fact list.
+        """
+        if index is None:
+            index = {}
         for fact in facts:
-            key = (fact.get("category"), fact.get("fact"))
-            if key not in seen:
-                seen.add(key)
-                unique.append(fact)
-        return unique
-
-    def _deduplicate_sources(
-        self, sources: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Remove duplicate sources based on system name."""
-        seen = set()
-        unique = []
+            index.setdefault((fact.get("category"), fact.get("fact")), fact)
+        return index
+
+    def _index_sources(
+        self,
+        sources: List[Dict[str, Any]],
+        index: Optional[Dict[Any, Dict[str, Any]]] = None,
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Add sources to an index keyed on system name (first occurrence wins)."""
+        if index is None:
+            index = {}
         for source in sources:
-            system = source.get("system")
-            if system not in seen:
-                seen.add(system)
-                unique.append(source)
-        return unique
+            index.setdefault(source.get("system"), source)
+        return index
 
     def _load_knowledge_base(self, extracted_path: Path) -> Dict[str, Any]:
         """Load existing knowledge_base.json or return empty."""
         kb_path = extracted_path / "knowledge_base.json"
         if kb_path.exists():
             try:
-                with open(kb_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return _load_json(kb_path)
             except Exception:
                 pass
         return {"facts": [], "sources": [], "exceptions": [], "unknowns": []}
 
     def _load_analysis_log(self, extracted_path: Path) -> List[Dict[str, Any]]:
-        """Load existing analysis_log.json or return empty."""
-        log_path = extracted_path / "analysis_log.json"
+        """Load existing analysis_log.jsonl or return empty.
+
+        A legacy analysis_log.json array is migrated to JSONL on first load.
+        """
+        log_path = extracted_path / "analysis_log.jsonl"
+        legacy_path = extracted_path / "analysis_log.json"
+        if not log_path.exists() and legacy_path.exists():
+            try:
+                entries = _load_json(legacy_path)
+            except Exception:
+                return []
+            self._save_analysis_log(extracted_path, entries)
+            if log_path.exists():
+                legacy_path.unlink()
+            return entries
+
+        entries = []
         if log_path.exists():
             try:
                 with open(log_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                    for line in f:
+                        if line.strip():
+                            try:
+                                entries.append(_loads_json(line))
+                            except ValueError:
+                                # Skip a line torn by an interrupted append
+                                continue
             except Exception:
                 pass
-        return []
+        return entries
 
     def _save_knowledge_base(
         self, extracted_path: Path, knowledge_base: Dict[str, Any]
@@ -424,22 +820,24 @@ IMPORTANT:
         kb_path = extracted_path / "knowledge_base.json"
         try:
             with open(kb_path, "w", encoding="utf-8") as f:
-                json.dump(knowledge_base, f, indent=2, ensure_ascii=False)
+                f.write(_dump_json(knowledge_base))
         except (IOError, OSError) as e:
             # Log error but don't crash the entire process
             print(f"Warning: Failed to save knowledge_base.json: {e}")
 
     def _save_analysis_log(
-        self, extracted_path: Path, analysis_log: List[Dict[str, Any]]
+        self, extracted_path: Path, new_entries: List[Dict[str, Any]]
     ) -> None:
-        """Save analysis_log.json."""
-        log_path = extracted_path / "analysis_log.json"
+        """Append new entries to analysis_log.jsonl, one JSON object per line."""
+        log_path = extracted_path / "analysis_log.jsonl"
         try:
-            with open(log_path, "w", encoding="utf-8") as f:
-                json.dump(analysis_log, f, indent=2, ensure_ascii=False)
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.writelines(
+                    _dump_json(entry, indent=False) + "\n" for entry in new_entries
+                )
         except (IOError, OSError) as e:
             # Log error but don't crash the entire process
-            print(f"Warning: Failed to save analysis_log.json: {e}")
+            print(f"Warning: Failed to save analysis_log.jsonl: {e}")
 
 
 if __name__ == "__main__":
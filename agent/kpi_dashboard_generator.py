@@ -24,8 +24,39 @@ Author: Intelligent Automation Agent
 import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
 from datetime import datetime
 
+from agent.atomic_write import atomic_write_text
+from agent.json_cache import cached_load
+
+try:
+    import orjson  # optional: faster JSON serialization
+
+    def _dump_json(data: Any) -> str:
+        """Serialize data with orjson, falling back for values it rejects."""
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return json.dumps(data, indent=2, ensure_ascii=False)
+except ImportError:
+    def _dump_json(data: Any) -> str:
+        """Serialize data with the standard library."""
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+@dataclass(frozen=True, slots=True)
+class KPITemplate:
+    """Standard definition of one KPI."""
+    name: str
+    description: str
+    unit: str
+    target_improvement: float
+    calculation: str
+
 
 class KPIDashboardGenerator:
     """
@@ -40,79 +71,108 @@ class KPIDashboardGenerator:
 
     # Standard KPI templates by category
     KPI_TEMPLATES = {
-        "time": [
-            {
-                "name": "Cycle Time",
-                "description": "Average time to complete process from start to finish",
-                "unit": "hours",
-                "target_improvement": 30,  # 30% reduction
-                "calculation": "Sum of all step cycle times"
-            },
-            {
-                "name": "Lead Time",
-                "description": "Total elapsed time including wait times",
-                "unit": "hours",
-                "target_improvement": 40,  # 40% reduction
-                "calculation": "Cycle time + Wait time"
-            },
-            {
-                "name": "Wait Time",
-                "description": "Time spent waiting between steps",
-                "unit": "hours",
-                "target_improvement": 50,  # 50% reduction
-                "calculation": "Sum of all delays and queuing"
-            }
-        ],
-        "cost": [
-            {
-                "name": "Process Cost per Unit",
-                "description": "Average cost to process one transaction/item",
-                "unit": "currency",
-                "target_improvement": 25,  # 25% reduction
-                "calculation": "Total labor cost / Volume"
-            },
-            {
-                "name": "Error Cost",
-                "description": "Cost of rework and corrections",
-                "unit": "currency",
-                "target_improvement": 60,  # 60% reduction
-                "calculation": "Exception count * Average rework time * Hourly rate"
-            }
-        ],
-        "quality": [
-            {
-                "name": "First Pass Yield",
-                "description": "Percentage of work completed correctly the first time",
-                "unit": "percentage",
-                "target_improvement": 20,  # 20 percentage point increase
-                "calculation": "(Total - Exceptions) / Total * 100"
-            },
-            {
-                "name": "Error Rate",
-                "description": "Percentage of transactions with errors",
-                "unit": "percentage",
-                "target_improvement": -50,  # 50% reduction (negative = reduce)
-                "calculation": "Exceptions / Total * 100"
-            }
-        ],
-        "volume": [
-            {
-                "name": "Throughput",
-                "description": "Number of transactions processed per day",
-                "unit": "count/day",
-                "target_improvement": 50,  # 50% increase
-                "calculation": "Total transactions / Working days"
-            },
-            {
-                "name": "Capacity Utilization",
-                "description": "Percentage of available capacity being used",
-                "unit": "percentage",
-                "target_improvement": 30,  # 30 percentage point increase
-                "calculation": "Actual volume / Maximum capacity * 100"
-            }
-        ]
+        "time": (
+            KPITemplate(
+                name="Cycle Time",
+                description="Average time to complete process from start to finish",
+                unit="hours",
+                target_improvement=30,  # 30% reduction
+                calculation="Sum of all step cycle times"
+            ),
+            KPITemplate(
+                name="Lead Time",
+                description="Total elapsed time including wait times",
+                unit="hours",
+                target_improvement=40,  # 40% reduction
+                calculation="Cycle time + Wait time"
+            ),
+            KPITemplate(
+                name="Wait Time",
+                description="Time spent waiting between steps",
+                unit="hours",
+                target_improvement=50,  # 50% reduction
+                calculation="Sum of all delays and queuing"
+            )
+        ),
+        "cost": (
+            KPITemplate(
+                name="Process Cost per Unit",
+                description="Average cost to process one transaction/item",
+                unit="currency",
+                target_improvement=25,  # 25% reduction
+                calculation="Total labor cost / Volume"
+            ),
+            KPITemplate(
+                name="Error Cost",
+                description="Cost of rework and corrections",
+                unit="currency",
+                target_improvement=60,  # 60% reduction
+                calculation="Exception count * Average rework time * Hourly rate"
+            )
+        ),
+        "quality": (
+            KPITemplate(
+                name="First Pass Yield",
+                description="Percentage of work completed correctly the first time",
+                unit="percentage",
+                target_improvement=20,  # 20 percentage point increase
+                calculation="(Total - Exceptions) / Total * 100"
+            ),
+            KPITemplate(
+                name="Error Rate",
+                description="Percentage of transactions with errors",
+                unit="percentage",
+                target_improvement=-50,  # 50% reduction (negative = reduce)
+                calculation="Exceptions / Total * 100"
+            )
+        ),
+        "volume": (
+            KPITemplate(
+                name="Throughput",
+                description="Number of transactions processed per day",
+                unit="count/day",
+                target_improvement=50,  # 50% increase
+                calculation="Total transactions / Working days"
+            ),
+            KPITemplate(
+                name="Capacity Utilization",
+                description="Percentage of available capacity being used",
+                unit="percentage",
+                target_improvement=30,  # 30 percentage point increase
+                calculation="Actual volume / Maximum capacity * 100"
+            )
+        )
     }
 
+    # KPI name -> (baseline metric key within its category, default value).
+    # Keys starting with "_" are derived values handled in _generate_kpis.
+    KPI_METRIC_BINDINGS = {
+        "Cycle Time": ("average_cycle_time", None),
+        "Lead Time": ("average_lead_time", None),
+        "Wait Time": ("_wait_from_vsm", None),
+        "Process Cost per Unit": ("cost_per_transaction", None),
+        "Error Cost": ("error_cost", None),
+        "First Pass Yield": ("_first_pass_yield", 10),  # Default 10% error rate
+        "Error Rate": ("error_rate", 10),  # Default 10%
+        "Throughput": ("daily_volume", None),
+        "Capacity Utilization": ("capacity_utilization", 60),
+    }
+
+    # Category -> (tracking frequency, rounding precision)
+    KPI_CATEGORY_SETTINGS = {
+        "time": ("weekly", 2),
+        "cost": ("monthly", 2),
+        "quality": ("weekly", 1),
+        "volume": ("daily", 1),
+    }
+
+    # Input and output deliverables, relative to the project directory
+    INPUT_PATHS = {
+        "baseline": Path("deliverables/1-standardization/baseline_metrics.json"),
+        "vsm": Path("deliverables/2-optimization/value_stream_map.json"),
+    }
+    OUTPUT_PATH = Path("deliverables/2-optimization/kpi_dashboard.json")
+
     def __init__(self, projects_root: str = "projects"):
         """
         Initialize KPI Dashboard Generator.
@@ -150,9 +210,10 @@ class KPIDashboardGenerator:
                 "missing_fields": [...]
             }
         """
+        project_dir = self.projects_root / project_id
         try:
             # Load baseline metrics
-            baseline_metrics = self._load_baseline_metrics(project_id)
+            baseline_metrics = self._load_input(project_dir, "baseline")
             if not baseline_metrics:
                 return {
                     "status": "failed",
@@ -161,63 +222,54 @@ class KPIDashboardGenerator:
                     "error": "Baseline metrics not found. Generate baseline metrics first."
                 }
 
-            # Load value stream map (optional)
-            value_stream = self._load_value_stream(project_id)
+            # Load value stream map (optional, source of the Wait Time KPI)
+            value_stream = self._load_input(project_dir, "vsm")
 
-            # Load waste analysis (optional)
-            waste_analysis = self._load_waste_analysis(project_id)
-
-            # Generate KPIs for each category
-            time_kpis = self._generate_time_kpis(baseline_metrics, value_stream)
-            cost_kpis = self._generate_cost_kpis(baseline_metrics, waste_analysis)
-            quality_kpis = self._generate_quality_kpis(baseline_metrics, waste_analysis)
-            volume_kpis = self._generate_volume_kpis(baseline_metrics)
+            # Generate KPIs for all categories
+            kpis_by_category = self._generate_all_kpis(baseline_metrics, value_stream)
+            category_counts = {
+                category: len(kpis) for category, kpis in kpis_by_category.items()
+            }
+            total_kpis = sum(category_counts.values())
 
-            # Combine all KPIs
-            all_kpis = time_kpis + cost_kpis + quality_kpis + volume_kpis
+            # _generate_all_kpis only emits a KPI once its target is
+            # computed, so targets are set exactly when any KPI exists
+            targets_set = total_kpis > 0
 
             # Calculate summary
             summary = {
-                "total_kpis": len(all_kpis),
+                "total_kpis": total_kpis,
                 "baseline_established": True,
-                "targets_set": all(kpi.get("target") is not None for kpi in all_kpis),
-                "categories": {
-                    "time": len(time_kpis),
-                    "cost": len(cost_kpis),
-                    "quality": len(quality_kpis),
-                    "volume": len(volume_kpis)
-                }
+                "targets_set": targets_set,
+                "categories": category_counts
             }
 
             # Calculate completeness
+            kpis_score = 100 if total_kpis else 0
+            baselines_score = 100 if baseline_metrics else 0
+            targets_score = 100 if targets_set else 50
             completeness = {
-                "kpis_defined": 100 if all_kpis else 0,
-                "baselines_set": 100 if baseline_metrics else 0,
-                "targets_set": 100 if summary["targets_set"] else 50,
-                "overall": sum([
-                    100 if all_kpis else 0,
-                    100 if baseline_metrics else 0,
-                    100 if summary["targets_set"] else 50
-                ]) // 3
+                "kpis_defined": kpis_score,
+                "baselines_set": baselines_score,
+                "targets_set": targets_score,
+                "overall": (kpis_score + baselines_score + targets_score) // 3
             }
 
             # Identify missing fields
             missing = []
-            if not all_kpis:
+            if not total_kpis:
                 missing.append("kpis")
-            if not summary["targets_set"]:
+            if not targets_set:
                 missing.append("targets")
 
             # Save deliverable
             deliverable_data = {
-                "time_kpis": time_kpis,
-                "cost_kpis": cost_kpis,
-                "quality_kpis": quality_kpis,
-                "volume_kpis": volume_kpis,
-                "summary": summary
+                f"{category}_kpis": kpis
+                for category, kpis in kpis_by_category.items()
             }
+            deliverable_data["summary"] = summary
 
-            self._save_deliverable(project_id, deliverable_data)
+            self._save_deliverable(project_dir, deliverable_data)
 
             return {
                 "status": "success" if not missing else "partial",
@@ -236,228 +288,94 @@ class KPIDashboardGenerator:
                 "error": str(e)
             }
 
-    def _generate_time_kpis(
-        self,
-        baseline_metrics: Dict[str, Any],
-        value_stream: Optional[Dict[str, Any]]
-    ) -> List[Dict]:
-        """
-        Generate time-based KPIs.
-        """
-        kpis = []
-
-        # Extract baseline time data
-        time_data = baseline_metrics.get("time", {})
-
-        for template in self.KPI_TEMPLATES["time"]:
-            kpi_name = template["name"]
-            baseline_value = None
-
-            # Map KPI to baseline metric
-            if "cycle time" in kpi_name.lower():
-                baseline_value = time_data.get("average_cycle_time")
-            elif "lead time" in kpi_name.lower():
-                baseline_value = time_data.get("average_lead_time")
-            elif "wait time" in kpi_name.lower():
-                # Calculate from value stream if available
-                if value_stream:
-                    baseline_value = value_stream.get("metrics", {}).get("total_wait_time")
-
-            if baseline_value is not None:
-                # Calculate target
-                improvement_pct = template["target_improvement"]
-                target_value = baseline_value * (1 - improvement_pct / 100)
-
-                kpis.append({
-                    "name": kpi_name,
-                    "description": template["description"],
-                    "category": "time",
-                    "unit": template["unit"],
-                    "baseline": round(baseline_value, 2),
-                    "target": round(target_value, 2),
-                    "improvement_target_pct": improvement_pct,
-                    "calculation": template["calculation"],
-                    "tracking_frequency": "weekly"
-                })
-
-        return kpis
-
-    def _generate_cost_kpis(
+    def _generate_all_kpis(
         self,
         baseline_metrics: Dict[str, Any],
-        waste_analysis: Optional[Dict[str, Any]]
-    ) -> List[Dict]:
-        """
-        Generate cost-based KPIs.
+        value_stream: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict]]:
         """
-        kpis = []
-        cost_data = baseline_metrics.get("cost", {})
-
-        for template in self.KPI_TEMPLATES["cost"]:
-            kpi_name = template["name"]
-            baseline_value = None
-
-            if "process cost" in kpi_name.lower():
-                baseline_value = cost_data.get("cost_per_transaction")
-            elif "error cost" in kpi_name.lower():
-                baseline_value = cost_data.get("error_cost")
-
-            if baseline_value is not None:
-                improvement_pct = template["target_improvement"]
-                target_value = baseline_value * (1 - improvement_pct / 100)
+        Generate KPIs for every category in one pass over KPI_TEMPLATES.
 
-                kpis.append({
-                    "name": kpi_name,
-                    "description": template["description"],
-                    "category": "cost",
-                    "unit": template["unit"],
-                    "baseline": round(baseline_value, 2),
-                    "target": round(target_value, 2),
-                    "improvement_target_pct": improvement_pct,
-                    "calculation": template["calculation"],
-                    "tracking_frequency": "monthly"
-                })
-
-        return kpis
-
-    def _generate_quality_kpis(
-        self,
-        baseline_metrics: Dict[str, Any],
-        waste_analysis: Optional[Dict[str, Any]]
-    ) -> List[Dict]:
-        """
-        Generate quality-based KPIs.
+        Returns a dict mapping each category to its KPIs, in template order.
         """
-        kpis = []
-        quality_data = baseline_metrics.get("quality", {})
-
-        for template in self.KPI_TEMPLATES["quality"]:
-            kpi_name = template["name"]
-            baseline_value = None
-
-            if "first pass yield" in kpi_name.lower():
-                error_rate = quality_data.get("error_rate", 10)  # Default 10%
-                baseline_value = 100 - error_rate  # FPY = 100% - error rate
-            elif "error rate" in kpi_name.lower():
-                baseline_value = quality_data.get("error_rate", 10)
-
-            if baseline_value is not None:
-                improvement_pct = template["target_improvement"]
-
-                if improvement_pct < 0:  # For metrics we want to reduce
+        kpis_by_category: Dict[str, List[Dict]] = {}
+
+        for category, templates in self.KPI_TEMPLATES.items():
+            kpis = kpis_by_category[category] = []
+            tracking_frequency, precision = self.KPI_CATEGORY_SETTINGS[category]
+            category_data = baseline_metrics.get(category, {})
+
+            for template in templates:
+                kpi_name = template.name
+                metric_key, default = self.KPI_METRIC_BINDINGS[kpi_name]
+
+                if metric_key == "_wait_from_vsm":
+                    # Calculate from value stream if available
+                    baseline_value = (
+                        value_stream.get("metrics", {}).get("total_wait_time")
+                        if value_stream else None
+                    )
+                elif metric_key == "_first_pass_yield":
+                    # FPY = 100% - error rate
+                    baseline_value = 100 - category_data.get("error_rate", default)
+                else:
+                    baseline_value = category_data.get(metric_key, default)
+
+                if baseline_value is None:
+                    continue
+
+                improvement_pct = template.target_improvement
+                if category == "quality":
+                    if improvement_pct < 0:  # For metrics we want to reduce
+                        target_value = baseline_value * (1 + improvement_pct / 100)
+                    else:  # Percentage point increase
+                        target_value = baseline_value + improvement_pct
+                elif category == "volume":
                     target_value = baseline_value * (1 + improvement_pct / 100)
-                else:  # For metrics we want to increase
-                    target_value = baseline_value + improvement_pct
+                else:  # time and cost are reduced
+                    target_value = baseline_value * (1 - improvement_pct / 100)
 
                 kpis.append({
                     "name": kpi_name,
-                    "description": template["description"],
-                    "category": "quality",
-                    "unit": template["unit"],
-                    "baseline": round(baseline_value, 1),
-                    "target": round(target_value, 1),
+                    "description": template.description,
+                    "category": category,
+                    "unit": template.unit,
+                    "baseline": round(baseline_value, precision),
+                    "target": round(target_value, precision),
                     "improvement_target_pct": abs(improvement_pct),
-                    "calculation": template["calculation"],
-                    "tracking_frequency": "weekly"
+                    "calculation": template.calculation,
+                    "tracking_frequency": tracking_frequency
                 })
 
-        return kpis
-
-    def _generate_volume_kpis(self, baseline_metrics: Dict[str, Any]) -> List[Dict]:
-        """
-        Generate volume/throughput KPIs.
-        """
-        kpis = []
-        volume_data = baseline_metrics.get("volume", {})
-
-        for template in self.KPI_TEMPLATES["volume"]:
-            kpi_name = template["name"]
-            baseline_value = None
+        return kpis_by_category
 
-            if "throughput" in kpi_name.lower():
-                baseline_value = volume_data.get("daily_volume")
-            elif "capacity" in kpi_name.lower():
-                baseline_value = volume_data.get("capacity_utilization", 60)
-
-            if baseline_value is not None:
-                improvement_pct = template["target_improvement"]
-                target_value = baseline_value * (1 + improvement_pct / 100)
-
-                kpis.append({
-                    "name": kpi_name,
-                    "description": template["description"],
-                    "category": "volume",
-                    "unit": template["unit"],
-                    "baseline": round(baseline_value, 1),
-                    "target": round(target_value, 1),
-                    "improvement_target_pct": improvement_pct,
-                    "calculation": template["calculation"],
-                    "tracking_frequency": "daily"
-                })
+    def _load_input(self, project_dir: Path, key: str) -> Optional[Dict[str, Any]]:
+        """Load one input deliverable (see INPUT_PATHS) if it exists; the result is read-only."""
+        path = project_dir / self.INPUT_PATHS[key]
 
-        return kpis
-
-    def _load_baseline_metrics(self, project_id: str) -> Optional[Dict[str, Any]]:
-        """Load baseline metrics from Standardization phase."""
-        metrics_path = (
-            self.projects_root / project_id / "deliverables" / "1-standardization" / "baseline_metrics.json"
-        )
-
-        if metrics_path.exists():
-            try:
-                with open(metrics_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                return None
-
-        return None
-
-    def _load_value_stream(self, project_id: str) -> Optional[Dict[str, Any]]:
-        """Load value stream map if it exists."""
-        vsm_path = (
-            self.projects_root / project_id / "deliverables" / "2-optimization" / "value_stream_map.json"
-        )
-
-        if vsm_path.exists():
-            try:
-                with open(vsm_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                return None
-
-        return None
-
-    def _load_waste_analysis(self, project_id: str) -> Optional[Dict[str, Any]]:
-        """Load waste analysis if it exists."""
-        waste_path = (
-            self.projects_root / project_id / "deliverables" / "2-optimization" / "waste_analysis.json"
-        )
-
-        if waste_path.exists():
+        if path.exists():
             try:
-                with open(waste_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return cached_load(path)
             except Exception:
                 return None
 
         return None
 
-    def _save_deliverable(self, project_id: str, data: Dict[str, Any]) -> None:
+    def _save_deliverable(self, project_dir: Path, data: Dict[str, Any]) -> None:
         """
         Save KPI dashboard to project deliverables folder.
 
         Args:
-            project_id: Project ID
+            project_dir: Project directory (projects_root / project_id)
             data: KPI dashboard data
         """
-        deliverable_path = (
-            self.projects_root / project_id / "deliverables" / "2-optimization"
-        )
+        output_file = project_dir / self.OUTPUT_PATH
+        deliverable_path = output_file.parent
         deliverable_path.mkdir(parents=True, exist_ok=True)
 
-        output_file = deliverable_path / "kpi_dashboard.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Serialize first, then replace the dashboard atomically so readers
+        # never see a half-written file
+        atomic_write_text(output_file, _dump_json(data))
 
 
 if __name__ == "__main__":
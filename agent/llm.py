@@ -1,9 +1,11 @@
 """LLM helper: model map, fallback escalation, and cost logging.
 
-Provides a single entrypoint `call_model(...)` used by agents to invoke
-an LLM according to the configured MODEL_MAP. Handles automatic
-escalation to a premium model on low-confidence results and appends a
-cost entry to `projects/<project_id>/cost_log.json`.
+Provides a single entrypoint `call_model(...)` (and its async twin
+`call_model_async(...)`) used by agents to invoke an LLM according to
+the configured MODEL_MAP. Handles automatic escalation to a premium
+model on low-confidence results, answers repeated identical requests
+from `projects/<project_id>/.llm_cache/` for callers that opt in (see
+agent.llm_cache), and appends a cost entry to `projects/<project_id>/cost_log.jsonl`.
 
 The module supports a dry-run mode when no API keys are present so
 unit tests and local development can run without secrets.
@@ -11,12 +13,49 @@ unit tests and local development can run without secrets.
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
 import os
+import queue
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agent.llm_cache import LLMDiskCache, llm_cache_enabled, llm_cache_key
+
+try:
+    import openai  # optional: OpenAI provider SDK
+except ImportError:
+    openai = None
+
+try:
+    import anthropic  # optional: Anthropic provider SDK
+except ImportError:
+    anthropic = None
+
+try:
+    import orjson  # optional: faster JSON serialization
+
+    _loads_json = orjson.loads
+
+    def _dump_json(data: Any) -> str:
+        """Serialize data with orjson, falling back for values it rejects."""
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return json.dumps(data, ensure_ascii=False)
+except ImportError:
+    _loads_json = json.loads
+
+    def _dump_json(data: Any) -> str:
+        """Serialize data with the standard library."""
+        return json.dumps(data, ensure_ascii=False)
+
 
 DEFAULT_MODEL_MAP = {
     "knowledge_processor": "gpt-4o-mini",  # Upgraded from gpt-3.5-turbo-16k for better extraction
@@ -28,8 +67,35 @@ DEFAULT_MODEL_MAP = {
 }
 
 
+# Serialises cost log writes and legacy migration across threads
+_COST_LOG_LOCK = threading.Lock()
+
+# Cost log paths already checked for a legacy cost_log.json in this process
+_CHECKED_COST_LOGS: set = set()
+
+# Cost log entries are written by a background thread: callers only
+# enqueue (path, entry) pairs. Entries beyond COST_LOG_QUEUE_SIZE are
+# dropped (and counted) rather than blocking the caller.
+COST_LOG_QUEUE_SIZE = 10_000
+COST_LOG_BATCH_SIZE = 64
+# Longest load_cost_log() waits for queued entries before reading
+COST_LOG_FLUSH_TIMEOUT = 5.0
+_COST_LOG_QUEUE: "queue.Queue[Tuple[Path, Dict[str, Any]]]" = queue.Queue(maxsize=COST_LOG_QUEUE_SIZE)
+_COST_LOG_WORKER: Optional[threading.Thread] = None
+_COST_LOG_WORKER_LOCK = threading.Lock()
+# Entries enqueued but not yet written; flush_cost_logs() waits for zero
+_COST_LOG_PENDING = 0
+_COST_LOG_IDLE = threading.Condition()
+_COST_LOG_DROPPED = 0
+
+
+@lru_cache(maxsize=1)
 def _load_model_map() -> Dict[str, str]:
-    """Load model map from env overrides or default."""
+    """Load model map from env overrides or default.
+
+    Cached for the life of the process; call reset_config_cache() after
+    changing MODEL_* environment variables.
+    """
     model_map = DEFAULT_MODEL_MAP.copy()
     for key in list(model_map.keys()):
         env_key = f"MODEL_{key.upper()}"
@@ -38,6 +104,12 @@ def _load_model_map() -> Dict[str, str]:
     return model_map
 
 
+def model_for_agent(agent: str, preferred_model: Optional[str] = None) -> str:
+    """Return the model call_model uses first for an agent."""
+    return preferred_model or _load_model_map().get(agent, "gpt-4o-mini")
+
+
+@lru_cache(maxsize=1)
 def _get_escalation_threshold() -> float:
     try:
         return float(os.environ.get("MODEL_ESCALATION_CONFIDENCE", "0.7"))
@@ -45,34 +117,193 @@ def _get_escalation_threshold() -> float:
         return 0.7
 
 
+def reset_config_cache() -> None:
+    """Forget cached model map, escalation threshold and provider clients.
+
+    For tests and tools that change MODEL_*, MODEL_ESCALATION_CONFIDENCE
+    or API key variables at runtime.
+    """
+    _load_model_map.cache_clear()
+    _get_escalation_threshold.cache_clear()
+    # Clients capture the API keys they were built with
+    _openai_client.cache_clear()
+    _anthropic_client.cache_clear()
+    with _ASYNC_CLIENTS_LOCK:
+        _ASYNC_CLIENTS.clear()
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO 8601 with millisecond precision and a Z suffix."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
 def _project_cost_log_path(projects_root: Path, project_id: str) -> Path:
-    p = projects_root / project_id / "cost_log.json"
+    p = projects_root / project_id / "cost_log.jsonl"
     return p
 
 
-def append_cost_log(projects_root: Path, project_id: str, entry: Dict[str, Any]) -> None:
-    """Append a cost log entry to the project's cost_log.json.
+def _migrate_legacy_cost_log(path: Path) -> None:
+    """Convert a legacy cost_log.json list next to path into JSONL lines.
 
-    Creates the file if missing and keeps a list of entries.
+    Caller must hold _COST_LOG_LOCK. Does nothing once the legacy file is gone.
     """
-    path = _project_cost_log_path(projects_root, project_id)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    logs = []
-    if path.exists():
+    legacy = path.with_suffix(".json")
+    if not legacy.exists():
+        return
+    try:
+        with open(legacy, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except Exception:
+        entries = []
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(_dump_json(e) + "\n" for e in entries)
+    legacy.unlink()
+
+
+def migrate_cost_log(projects_root: Path, project_id: str) -> None:
+    """One-shot conversion of a project's cost_log.json to cost_log.jsonl."""
+    path = _project_cost_log_path(Path(projects_root), project_id)
+    with _COST_LOG_LOCK:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                logs = json.load(f)
-        except Exception:
-            logs = []
+            _migrate_legacy_cost_log(path)
+            _CHECKED_COST_LOGS.add(path)
+        except OSError:
+            pass
 
-    logs.append(entry)
 
+def _write_cost_log_batch(batch: List[Tuple[Path, Dict[str, Any]]]) -> None:
+    """Append a batch of entries, opening each project's log once."""
+    lines_by_path: Dict[Path, List[str]] = {}
+    for path, entry in batch:
+        try:
+            line = _dump_json(entry) + "\n"
+        except (TypeError, ValueError):
+            # Skip an entry that cannot be serialized
+            continue
+        lines_by_path.setdefault(path, []).append(line)
+    with _COST_LOG_LOCK:
+        for path, lines in lines_by_path.items():
+            try:
+                if path not in _CHECKED_COST_LOGS:
+                    _migrate_legacy_cost_log(path)
+                    _CHECKED_COST_LOGS.add(path)
+                try:
+                    f = open(path, "a", encoding="utf-8")
+                except FileNotFoundError:
+                    # First entry for a new project
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    f = open(path, "a", encoding="utf-8")
+                with f:
+                    f.writelines(lines)
+            except Exception:
+                # Silently fail on cost logging errors to avoid disrupting the main flow
+                pass
+
+
+def _cost_log_worker() -> None:
+    """Write queued cost log entries, batching whatever is already queued."""
+    global _COST_LOG_PENDING
+    while True:
+        batch = [_COST_LOG_QUEUE.get()]
+        while len(batch) < COST_LOG_BATCH_SIZE:
+            try:
+                batch.append(_COST_LOG_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _write_cost_log_batch(batch)
+        except Exception as e:
+            # Keep the writer alive; losing one batch beats losing the rest
+            print(f"Warning: Failed to write {len(batch)} cost log entries: {e}")
+        finally:
+            with _COST_LOG_IDLE:
+                _COST_LOG_PENDING -= len(batch)
+                _COST_LOG_IDLE.notify_all()
+
+
+def _ensure_cost_log_worker() -> None:
+    """Start the writer thread, or restart it if it has died."""
+    global _COST_LOG_WORKER
+    worker = _COST_LOG_WORKER
+    if worker is not None and worker.is_alive():
+        return
+    with _COST_LOG_WORKER_LOCK:
+        if _COST_LOG_WORKER is None or not _COST_LOG_WORKER.is_alive():
+            worker = threading.Thread(target=_cost_log_worker, name="cost-log-writer", daemon=True)
+            worker.start()
+            _COST_LOG_WORKER = worker
+
+
+def flush_cost_logs(timeout: Optional[float] = None) -> bool:
+    """Wait until every queued cost log entry is written.
+
+    Returns False if entries were still pending when timeout expired.
+    """
+    with _COST_LOG_IDLE:
+        return _COST_LOG_IDLE.wait_for(lambda: _COST_LOG_PENDING == 0, timeout)
+
+
+# Give the writer up to two seconds to drain at interpreter exit
+atexit.register(flush_cost_logs, 2.0)
+
+
+def append_cost_log(projects_root: Path, project_id: str, entry: Dict[str, Any]) -> None:
+    """Queue a cost log entry for the project's cost_log.jsonl.
+
+    Returns immediately; a background thread writes one JSON object per
+    line, batching entries that arrive together, and migrates a legacy
+    cost_log.json list on its first write. The entry must not be mutated
+    after it is queued.
+    """
+    global _COST_LOG_PENDING, _COST_LOG_DROPPED
+    path = _project_cost_log_path(Path(projects_root), project_id)
+    _ensure_cost_log_worker()
+    with _COST_LOG_IDLE:
+        _COST_LOG_PENDING += 1
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(logs, f, indent=2, ensure_ascii=False)
-    except Exception:
-        # Silently fail on cost logging errors to avoid disrupting the main flow
-        pass
+        _COST_LOG_QUEUE.put_nowait((path, entry))
+    except queue.Full:
+        with _COST_LOG_IDLE:
+            _COST_LOG_PENDING -= 1
+            _COST_LOG_DROPPED += 1
+            _COST_LOG_IDLE.notify_all()
+        if _COST_LOG_DROPPED == 1:
+            print("Warning: Cost log queue full; dropping entries")
+
+
+def load_cost_log(projects_root: Path, project_id: str) -> List[Dict[str, Any]]:
+    """Return all cost log entries for a project (empty list if none).
+
+    Reads cost_log.jsonl, falling back to a not-yet-migrated cost_log.json.
+    Entries still queued in this process are written first, waiting at most
+    COST_LOG_FLUSH_TIMEOUT seconds.
+    """
+    path = _project_cost_log_path(Path(projects_root), project_id)
+    if _COST_LOG_PENDING:
+        _ensure_cost_log_worker()
+    if not flush_cost_logs(COST_LOG_FLUSH_TIMEOUT):
+        print(
+            f"Warning: Cost log writer did not drain within {COST_LOG_FLUSH_TIMEOUT}s; "
+            "reading the entries written so far"
+        )
+    legacy = path.with_suffix(".json")
+    entries: List[Dict[str, Any]] = []
+    if legacy.exists():
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
+                entries.extend(json.load(f))
+        except Exception:
+            pass
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        entries.append(_loads_json(line))
+                    except ValueError:
+                        # Skip a line torn by an interrupted append
+                        continue
+    return entries
 
 
 def _mock_model_response(prompt: str) -> Tuple[str, int, int, float, float]:
@@ -86,211 +317,492 @@ def _mock_model_response(prompt: str) -> Tuple[str, int, int, float, float]:
     return text, input_tokens, output_tokens, cost, confidence
 
 
-def call_model(
-    project_id: str,
-    agent: str,
-    prompt: str,
-    projects_root: Optional[Path] = None,
-    escalate_on_low_confidence: bool = True,
-    preferred_model: Optional[str] = None,
-    system_prompt: Optional[str] = None,
-) -> Dict[str, Any]:
-    """Call a model according to the model map and log cost.
+# Provider clients are built once per process so every call reuses the
+# SDK's pooled keep-alive HTTP connections instead of a fresh TLS handshake.
+# Callers check that the SDK imported before asking for a client.
+@lru_cache(maxsize=1)
+def _openai_client():
+    return openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 
-    Returns a dictionary with keys: `text`, `model`, `input_tokens`,
-    `output_tokens`, `cost_usd`, `confidence`, `escalated`, `duration_ms`.
 
-    If no API keys are configured the function returns a mocked response
-    and still writes a cost log entry with `cost_usd` 0.0.
+# Async clients pool connections on the event loop they were first used
+# on, and asyncio.run() (e.g. KnowledgeProcessor.process_project) starts a
+# new loop each time, so they are kept per running loop instead.
+_ASYNC_CLIENTS: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, Any]] = {}
+_ASYNC_CLIENTS_LOCK = threading.Lock()
+
+
+def _async_client(provider: str, factory: Callable[[], Any]) -> Any:
+    """Return the provider's async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _ASYNC_CLIENTS_LOCK:
+        # Drop clients whose loop has finished; they can no longer be used
+        for key in [k for k, (l, _) in _ASYNC_CLIENTS.items() if l.is_closed()]:
+            del _ASYNC_CLIENTS[key]
+        entry = _ASYNC_CLIENTS.get((provider, id(loop)))
+        if entry is None or entry[0] is not loop:
+            entry = (loop, factory())
+            _ASYNC_CLIENTS[(provider, id(loop))] = entry
+        return entry[1]
+
+
+def _async_openai_client():
+    return _async_client("openai", lambda: openai.AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY")))
+
+
+@lru_cache(maxsize=1)
+def _anthropic_client():
+    return anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+
+
+def _async_anthropic_client():
+    return _async_client("anthropic", lambda: anthropic.AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY")))
+
+
+def prewarm_clients() -> None:
+    """Open provider connections ahead of the first real request.
+
+    Builds the shared client for each configured provider and issues a
+    cheap model-list request from a background thread, so the TCP/TLS
+    handshake is done before the first user-facing call. Failures are
+    ignored; the first real call simply pays the handshake instead.
     """
-    start = time.time()
-    model_map = _load_model_map()
-    model = preferred_model or model_map.get(agent, "gpt-4o-mini")
-    projects_root = Path(projects_root or (Path(__file__).parent.parent / "projects"))
+    def _warm() -> None:
+        if openai is not None and os.environ.get("OPENAI_API_KEY"):
+            try:
+                _openai_client().models.list()
+            except Exception:
+                pass
+        if anthropic is not None and os.environ.get("ANTHROPIC_API_KEY"):
+            try:
+                _anthropic_client().models.list(limit=1)
+            except Exception:
+                pass
+
+    threading.Thread(target=_warm, name="llm-prewarm", daemon=True).start()
+
+
+def _model_cost(model: str, in_toks: int, out_toks: int) -> float:
+    """Price a call from its token counts (model pricing as of 2026)."""
+    if "gpt-4o" in model:
+        # gpt-4o: $5/1M input, $15/1M output
+        return (in_toks / 1_000_000 * 5.0) + (out_toks / 1_000_000 * 15.0)
+    if "gpt-3.5-turbo" in model:
+        # gpt-3.5-turbo: $0.50/1M input, $1.50/1M output
+        return (in_toks / 1_000_000 * 0.5) + (out_toks / 1_000_000 * 1.5)
+    if "claude-3-5-sonnet" in model or "claude-sonnet" in model:
+        # Claude Sonnet 3.5: $3/1M input, $15/1M output
+        return (in_toks / 1_000_000 * 3.0) + (out_toks / 1_000_000 * 15.0)
+    if "claude-3-opus" in model or "claude-opus" in model:
+        # Claude Opus: $15/1M input, $75/1M output
+        return (in_toks / 1_000_000 * 15.0) + (out_toks / 1_000_000 * 75.0)
+    if "claude-3-haiku" in model or "claude-haiku" in model:
+        # Claude Haiku: $0.25/1M input, $1.25/1M output
+        return (in_toks / 1_000_000 * 0.25) + (out_toks / 1_000_000 * 1.25)
+    return 0.0
+
+
+def _estimate_cancelled(
+    model: str, prompt: str, system_prompt: Optional[str]
+) -> Tuple[str, int, int, float, float]:
+    """Estimate the bill for a request cancelled while the provider had it.
+
+    Counts the input tokens (about four characters each); output generated
+    before the cancellation is unknown, so the estimate is a lower bound.
+    """
+    in_toks = max(1, len(prompt + (system_prompt or "")) // 4)
+    return model, in_toks, 0, _model_cost(model, in_toks, 0), 0.0
 
-    # Determine whether we have an OpenAI key (simple dry-run guard)
-    has_openai = bool(os.environ.get("OPENAI_API_KEY"))
-    has_anthropic = bool(os.environ.get("ANTHROPIC_API_KEY"))
-
-    # For now implement a simple call: if no keys, return mock response
-    if not (has_openai or has_anthropic):
-        text, in_toks, out_toks, cost, confidence = _mock_model_response(prompt)
-        duration_ms = int((time.time() - start) * 1000)
-        entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "project_id": project_id,
-            "agent": agent,
-            "model": model,
-            "phase": None,
-            "deliverable": None,
-            "input_tokens": in_toks,
-            "output_tokens": out_toks,
-            "cost_usd": cost,
-            "escalated": False,
-            "duration_ms": duration_ms,
-        }
-        try:
-            append_cost_log(projects_root, project_id, entry)
-        except Exception:
-            pass
 
-        return {
-            "text": text,
-            "model": model,
-            "input_tokens": in_toks,
-            "output_tokens": out_toks,
-            "cost_usd": cost,
-            "confidence": confidence,
-            "escalated": False,
-            "duration_ms": duration_ms,
-        }
-
-    # Real API call path (simplified): use OpenAI for models containing 'gpt',
-    # and Anthropic for models containing 'claude'. Implement light parsing of response
-    # and compute a crude confidence signal.
-    text = ""
-    in_toks = 0
-    out_toks = 0
-    cost = 0.0
-    confidence = 0.0
-    escalated = False
+def _openai_request(model: str, prompt: str, system_prompt: Optional[str]) -> Dict[str, Any]:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return {
+        "model": model,
+        "messages": messages,
+        "temperature": float(os.environ.get("OPENAI_TEMPERATURE", "0.2")),
+    }
 
-    # Minimal implementation to avoid importing heavy SDKs here.
-    # If OPENAI_API_KEY is present and model name contains 'gpt', call OpenAI.
-    if "gpt" in model and has_openai:
-        try:
-            from openai import OpenAI
-
-            client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            resp = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=float(os.environ.get("OPENAI_TEMPERATURE", "0.2")),
-            )
-            text = resp.choices[0].message.content
-            # token accounting: modern API provides usage in response
-            in_toks = resp.usage.prompt_tokens if resp.usage else 0
-            out_toks = resp.usage.completion_tokens if resp.usage else 0
-
-            # Calculate actual cost based on model pricing (as of 2026)
-            if "gpt-4o" in model:
-                # gpt-4o: $5/1M input, $15/1M output
-                cost = (in_toks / 1_000_000 * 5.0) + (out_toks / 1_000_000 * 15.0)
-            elif "gpt-3.5-turbo" in model:
-                # gpt-3.5-turbo: $0.50/1M input, $1.50/1M output
-                cost = (in_toks / 1_000_000 * 0.5) + (out_toks / 1_000_000 * 1.5)
-            else:
-                cost = 0.0
-
-            confidence = 0.9
-        except Exception as e:
-            # Fall back to mock if API call fails
-            text, in_toks, out_toks, cost, confidence = _mock_model_response(prompt)
 
-    elif "claude" in model and has_anthropic:
-        try:
-            from anthropic import Anthropic
-
-            client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-            # Use modern Messages API instead of deprecated Completions API
-            create_kwargs = {
-                "model": model,
-                "max_tokens": 1024,
-                "messages": [{"role": "user", "content": prompt}],
-            }
-            if system_prompt:
-                create_kwargs["system"] = system_prompt
-            resp = client.messages.create(**create_kwargs)
-            text = resp.content[0].text if resp.content else ""
-            # Modern API provides usage information
-            in_toks = resp.usage.input_tokens if resp.usage else 0
-            out_toks = resp.usage.output_tokens if resp.usage else 0
-
-            # Calculate actual cost based on Claude pricing (as of 2026)
-            if "claude-3-5-sonnet" in model or "claude-sonnet" in model:
-                # Claude Sonnet 3.5: $3/1M input, $15/1M output
-                cost = (in_toks / 1_000_000 * 3.0) + (out_toks / 1_000_000 * 15.0)
-            elif "claude-3-opus" in model or "claude-opus" in model:
-                # Claude Opus: $15/1M input, $75/1M output
-                cost = (in_toks / 1_000_000 * 15.0) + (out_toks / 1_000_000 * 75.0)
-            elif "claude-3-haiku" in model or "claude-haiku" in model:
-                # Claude Haiku: $0.25/1M input, $1.25/1M output
-                cost = (in_toks / 1_000_000 * 0.25) + (out_toks / 1_000_000 * 1.25)
-            else:
-                cost = 0.0
-
-            confidence = 0.88
-        except Exception:
-            text, in_toks, out_toks, cost, confidence = _mock_model_response(prompt)
+def _openai_response(model: str, resp: Any) -> Tuple[str, int, int, float, float]:
+    text = resp.choices[0].message.content
+    # token accounting: modern API provides usage in response
+    in_toks = resp.usage.prompt_tokens if resp.usage else 0
+    out_toks = resp.usage.completion_tokens if resp.usage else 0
 
-    else:
-        # Unknown model or provider; return mock response
-        text, in_toks, out_toks, cost, confidence = _mock_model_response(prompt)
+    return text, in_toks, out_toks, _model_cost(model, in_toks, out_toks), 0.9
 
-    duration_ms = int((time.time() - start) * 1000)
 
-    # If confidence low and escalation enabled, escalate once
-    if escalate_on_low_confidence and confidence < _get_escalation_threshold():
-        escalated = True
-        premium = os.environ.get("MODEL_FALLBACK", "gpt-4o")
-        # recursive call but avoid infinite recursion by disabling escalation
-        premium_result = call_model(project_id, agent, prompt, projects_root, escalate_on_low_confidence=False, preferred_model=premium, system_prompt=system_prompt)
-        # merge results: use premium result but log that escalation happened
-        premium_result["escalated"] = True
-        try:
-            # also record the original low-confidence call
-            append_cost_log(projects_root, project_id, {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "project_id": project_id,
-                "agent": agent,
-                "model": model,
-                "phase": None,
-                "deliverable": None,
-                "input_tokens": in_toks,
-                "output_tokens": out_toks,
-                "cost_usd": cost,
-                "escalated": True,
-                "duration_ms": duration_ms,
-            })
-        except Exception:
-            pass
-        return premium_result
+def _anthropic_request(model: str, prompt: str, system_prompt: Optional[str]) -> Dict[str, Any]:
+    # Use modern Messages API instead of deprecated Completions API
+    create_kwargs = {
+        "model": model,
+        "max_tokens": 1024,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    if system_prompt:
+        create_kwargs["system"] = system_prompt
+    return create_kwargs
+
+
+def _anthropic_response(model: str, resp: Any) -> Tuple[str, int, int, float, float]:
+    text = resp.content[0].text if resp.content else ""
+    # Modern API provides usage information
+    in_toks = resp.usage.input_tokens if resp.usage else 0
+    out_toks = resp.usage.output_tokens if resp.usage else 0
+
+    return text, in_toks, out_toks, _model_cost(model, in_toks, out_toks), 0.88
 
-    # Log the successful call
+
+def _cost_entry(
+    project_id: str,
+    agent: str,
+    attempts: List[Tuple[str, int, int, float, float]],
+    duration_ms: int,
+    cache_hit: bool = False,
+    discarded: Optional[List[Tuple[str, int, int, float, float]]] = None,
+    cancelled: Optional[List[Tuple[str, int, int, float, float]]] = None,
+) -> Dict[str, Any]:
+    """Build the cost log entry for one call_model invocation.
+
+    attempts holds (model, input_tokens, output_tokens, cost, confidence)
+    for each model tried, the last being the one whose answer is returned.
+    discarded holds raced calls that completed but were not used, and
+    cancelled holds estimates (see _estimate_cancelled) for raced calls
+    cut off mid-request. Token and cost figures are totals across all
+    three. cache_hit marks an answer served from the response cache.
+    """
+    final = attempts[-1]
+    billed = attempts + (discarded or []) + (cancelled or [])
     entry = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _now_iso(),
         "project_id": project_id,
         "agent": agent,
-        "model": model,
+        "model": final[0],
         "phase": None,
         "deliverable": None,
+        "input_tokens": sum(a[1] for a in billed),
+        "output_tokens": sum(a[2] for a in billed),
+        "cost_usd": sum(a[3] for a in billed),
+        "escalated": len(attempts) > 1,
+        "duration_ms": duration_ms,
+    }
+    if cache_hit:
+        entry["cache_hit"] = True
+    if discarded:
+        entry["discarded_models"] = [a[0] for a in discarded]
+    if cancelled:
+        entry["cancelled_models"] = [a[0] for a in cancelled]
+        entry["cost_estimated"] = True
+    if len(attempts) > 1:
+        entry.update({
+            "original_model": attempts[0][0],
+            "escalated_model": final[0],
+            "original_confidence": attempts[0][4],
+            "final_confidence": final[4],
+            "attempts": [
+                {
+                    "model": a[0],
+                    "input_tokens": a[1],
+                    "output_tokens": a[2],
+                    "cost_usd": a[3],
+                    "confidence": a[4],
+                }
+                for a in attempts
+            ],
+        })
+    return entry
+
+
+def _call_result(
+    text: str,
+    model: str,
+    in_toks: int,
+    out_toks: int,
+    cost: float,
+    confidence: float,
+    escalated: bool,
+    duration_ms: int,
+    source: str,
+) -> Dict[str, Any]:
+    result = {
+        "text": text,
+        "model": model,
         "input_tokens": in_toks,
         "output_tokens": out_toks,
         "cost_usd": cost,
+        "confidence": confidence,
         "escalated": escalated,
         "duration_ms": duration_ms,
+        "source": source,
     }
-    try:
-        append_cost_log(projects_root, project_id, entry)
-    except Exception:
-        pass
+    if source == "error":
+        result["error"] = f"{model} call failed"
+    return result
+
+
+def _cached_result(cached: Optional[Dict[str, Any]]) -> Optional[Tuple[str, int, int, float, float, str]]:
+    """Turn a stored response into a dispatch result; a hit bills nothing."""
+    if cached is None:
+        return None
+    return cached["text"], 0, 0, 0.0, cached["confidence"], "cache"
 
+
+def _cache_record(model: str, result: Tuple[str, int, int, float, float]) -> Dict[str, Any]:
+    text, in_toks, out_toks, cost, confidence = result
     return {
-        "text": text,
         "model": model,
+        "text": text,
         "input_tokens": in_toks,
         "output_tokens": out_toks,
         "cost_usd": cost,
         "confidence": confidence,
-        "escalated": escalated,
-        "duration_ms": duration_ms,
     }
 
 
+def _failed_dispatch(model: str, prompt: str, error: Exception) -> Tuple[str, int, int, float, float, str]:
+    """Placeholder result for a failed provider call, marked as an error."""
+    print(f"Warning: {model} call failed: {error}")
+    return _mock_model_response(prompt) + ("error",)
+
+
+def _dispatch(
+    model: str,
+    prompt: str,
+    system_prompt: Optional[str],
+    has_openai: bool,
+    has_anthropic: bool,
+    cache: Optional[LLMDiskCache] = None,
+) -> Tuple[str, int, int, float, float, str]:
+    """Run one model call.
+
+    Returns (text, input_tokens, output_tokens, cost, confidence, source);
+    source is "api", "cache" (a stored response for the identical request),
+    "mock" (no provider is configured for the model) or "error" (the
+    provider call failed; the text is a mock placeholder).
+    """
+    # Use OpenAI for models containing 'gpt', and Anthropic for models
+    # containing 'claude'; anything else gets a mock response.
+    try:
+        if "gpt" in model and has_openai:
+            request = _openai_request(model, prompt, system_prompt)
+            key = llm_cache_key(request)
+            hit = _cached_result(cache.get(key)) if cache else None
+            if hit:
+                return hit
+            resp = _openai_client().chat.completions.create(**request)
+            result = _openai_response(model, resp)
+        elif "claude" in model and has_anthropic:
+            request = _anthropic_request(model, prompt, system_prompt)
+            key = llm_cache_key(request)
+            hit = _cached_result(cache.get(key)) if cache else None
+            if hit:
+                return hit
+            resp = _anthropic_client().messages.create(**request)
+            result = _anthropic_response(model, resp)
+        else:
+            return _mock_model_response(prompt) + ("mock",)
+    except Exception as e:
+        return _failed_dispatch(model, prompt, e)
+    if cache:
+        cache.put(key, _cache_record(model, result))
+    return result + ("api",)
+
+
+async def _adispatch(
+    model: str,
+    prompt: str,
+    system_prompt: Optional[str],
+    has_openai: bool,
+    has_anthropic: bool,
+    cache: Optional[LLMDiskCache] = None,
+) -> Tuple[str, int, int, float, float, str]:
+    """Async counterpart of _dispatch; cache file I/O runs in a worker thread."""
+    try:
+        if "gpt" in model and has_openai:
+            request = _openai_request(model, prompt, system_prompt)
+            key = llm_cache_key(request)
+            hit = _cached_result(await asyncio.to_thread(cache.get, key)) if cache else None
+            if hit:
+                return hit
+            resp = await _async_openai_client().chat.completions.create(**request)
+            result = _openai_response(model, resp)
+        elif "claude" in model and has_anthropic:
+            request = _anthropic_request(model, prompt, system_prompt)
+            key = llm_cache_key(request)
+            hit = _cached_result(await asyncio.to_thread(cache.get, key)) if cache else None
+            if hit:
+                return hit
+            resp = await _async_anthropic_client().messages.create(**request)
+            result = _anthropic_response(model, resp)
+        else:
+            return _mock_model_response(prompt) + ("mock",)
+    except Exception as e:
+        return _failed_dispatch(model, prompt, e)
+    if cache:
+        await asyncio.to_thread(cache.put, key, _cache_record(model, result))
+    return result + ("api",)
+
+
+def _should_escalate(source: str, confidence: float, escalate_on_low_confidence: bool) -> bool:
+    """Escalate only a real (or cached real) answer below the threshold.
+
+    A mock or failed call says nothing about answer quality, so it never
+    escalates.
+    """
+    return (
+        escalate_on_low_confidence
+        and source in ("api", "cache")
+        and confidence < _get_escalation_threshold()
+    )
+
+
+def call_model(
+    project_id: str,
+    agent: str,
+    prompt: str,
+    projects_root: Optional[Path] = None,
+    escalate_on_low_confidence: bool = True,
+    preferred_model: Optional[str] = None,
+    system_prompt: Optional[str] = None,
+    use_cache: bool = False,
+) -> Dict[str, Any]:
+    """Call a model according to the model map and log cost.
+
+    Returns a dictionary with keys: `text`, `model`, `input_tokens`,
+    `output_tokens`, `cost_usd`, `confidence`, `escalated`, `duration_ms`
+    and `source` ("api", "cache", "mock" or "error").
+
+    If no API keys are configured the function returns a mocked response
+    and still writes a cost log entry with `cost_usd` 0.0. If the provider
+    call fails the text is a mock placeholder and the dictionary also has
+    an `error` key, so callers must not treat it as a real answer.
+
+    With use_cache=True an identical earlier request is answered from the
+    project's response cache instead of the provider. Only opt in where a
+    replayed answer is acceptable (extraction, deliverable generation);
+    conversational agents must get a fresh answer every turn.
+    """
+    start = time.time()
+    model = model_for_agent(agent, preferred_model)
+    projects_root = Path(projects_root or (Path(__file__).parent.parent / "projects"))
+
+    # Without a key and SDK every dispatch returns a mock response (dry-run mode)
+    has_openai = openai is not None and bool(os.environ.get("OPENAI_API_KEY"))
+    has_anthropic = anthropic is not None and bool(os.environ.get("ANTHROPIC_API_KEY"))
+
+    # Callers that opt in get identical requests answered from
+    # projects/<id>/.llm_cache/
+    cache = LLMDiskCache.for_project(projects_root, project_id) if use_cache and llm_cache_enabled() else None
+
+    attempts: List[Tuple[str, int, int, float, float]] = []
+    for attempt_model in (model, os.environ.get("MODEL_FALLBACK", "gpt-4o")):
+        text, in_toks, out_toks, cost, confidence, source = _dispatch(
+            attempt_model, prompt, system_prompt, has_openai, has_anthropic, cache
+        )
+        attempts.append((attempt_model, in_toks, out_toks, cost, confidence))
+        # Escalate at most once
+        if not _should_escalate(source, confidence, escalate_on_low_confidence):
+            break
+
+    duration_ms = int((time.time() - start) * 1000)
+    try:
+        append_cost_log(projects_root, project_id, _cost_entry(
+            project_id, agent, attempts, duration_ms, cache_hit=source == "cache"
+        ))
+    except Exception:
+        pass
+
+    escalated = len(attempts) > 1
+    return _call_result(text, attempt_model, in_toks, out_toks, cost, confidence, escalated, duration_ms, source)
+
+
+async def call_model_async(
+    project_id: str,
+    agent: str,
+    prompt: str,
+    projects_root: Optional[Path] = None,
+    escalate_on_low_confidence: bool = True,
+    preferred_model: Optional[str] = None,
+    system_prompt: Optional[str] = None,
+    use_cache: bool = False,
+) -> Dict[str, Any]:
+    """Async counterpart of call_model using the SDKs' async clients.
+
+    Takes the same arguments and returns the same dictionary, so agents
+    can fan several prompts out concurrently with asyncio.gather.
+    """
+    start = time.time()
+    model = model_for_agent(agent, preferred_model)
+    projects_root = Path(projects_root or (Path(__file__).parent.parent / "projects"))
+
+    has_openai = openai is not None and bool(os.environ.get("OPENAI_API_KEY"))
+    has_anthropic = anthropic is not None and bool(os.environ.get("ANTHROPIC_API_KEY"))
+
+    cache = LLMDiskCache.for_project(projects_root, project_id) if use_cache and llm_cache_enabled() else None
+    premium = os.environ.get("MODEL_FALLBACK", "gpt-4o")
+
+    # With LLM_RACE_ESCALATE=1 the premium call starts alongside the
+    # primary one, so an escalation costs max(primary, premium) latency
+    # instead of the sum; this spends more whenever both calls complete.
+    race = (
+        escalate_on_low_confidence
+        and os.environ.get("LLM_RACE_ESCALATE") == "1"
+        and premium != model
+        and (has_openai or has_anthropic)
+    )
+
+    attempts: List[Tuple[str, int, int, float, float]] = []
+    discarded: List[Tuple[str, int, int, float, float]] = []
+    cancelled: List[Tuple[str, int, int, float, float]] = []
+    if race:
+        premium_task = asyncio.create_task(_adispatch(
+            premium, prompt, system_prompt, has_openai, has_anthropic, cache
+        ))
+        try:
+            text, in_toks, out_toks, cost, confidence, source = await _adispatch(
+                model, prompt, system_prompt, has_openai, has_anthropic, cache
+            )
+            attempts.append((model, in_toks, out_toks, cost, confidence))
+            attempt_model = model
+            if _should_escalate(source, confidence, escalate_on_low_confidence):
+                text, in_toks, out_toks, cost, confidence, source = await premium_task
+                attempts.append((premium, in_toks, out_toks, cost, confidence))
+                attempt_model = premium
+            elif premium_task.done():
+                # Already answered (and billed) but not needed
+                _, p_in, p_out, p_cost, p_confidence, _ = premium_task.result()
+                discarded.append((premium, p_in, p_out, p_cost, p_confidence))
+        finally:
+            if not premium_task.done():
+                premium_task.cancel()
+                # The request may already be billed; log an estimate
+                if ("gpt" in premium and has_openai) or ("claude" in premium and has_anthropic):
+                    cancelled.append(_estimate_cancelled(premium, prompt, system_prompt))
+    else:
+        for attempt_model in (model, premium):
+            text, in_toks, out_toks, cost, confidence, source = await _adispatch(
+                attempt_model, prompt, system_prompt, has_openai, has_anthropic, cache
+            )
+            attempts.append((attempt_model, in_toks, out_toks, cost, confidence))
+            if not _should_escalate(source, confidence, escalate_on_low_confidence):
+                break
+
+    duration_ms = int((time.time() - start) * 1000)
+    try:
+        append_cost_log(projects_root, project_id, _cost_entry(
+            project_id, agent, attempts, duration_ms,
+            cache_hit=source == "cache", discarded=discarded, cancelled=cancelled,
+        ))
+    except Exception:
+        pass
+
+    escalated = len(attempts) > 1
+    return _call_result(text, attempt_model, in_toks, out_toks, cost, confidence, escalated, duration_ms, source)
+
+
 if __name__ == "__main__":
     # Quick manual test: will run in mock mode if keys are absent
     res = call_model("test-project", "knowledge_processor", "Extract suppliers and customers from the SOP.")
@@ -0,0 +1,230 @@
+"""LLM Cache - Reuse provider responses for identical requests.
+
+Stores each successful provider response under
+projects/<project_id>/.llm_cache/<first2>/<rest>.json, keyed by a hash of
+the exact request sent (model, messages or system prompt, temperature,
+max_tokens). Re-running a phase with unchanged inputs then returns the
+stored answers instead of billing the provider again. Each project's
+cache also keeps its recently used responses in memory, so repeats
+within one process skip the file read too.
+
+The cache is opt-in per call (call_model(..., use_cache=True)); it is
+meant for extraction and deliverable generation, not for conversation,
+where a repeated question must not replay the earlier answer.
+
+Set LLM_CACHE=0 to disable it for every caller (e.g. in tests that count
+calls). LLM_CACHE_MAX bounds both each project's in-memory LRU and its
+cache directory (default 1024 entries; the least recently used files are
+removed first), and LLM_CACHE_TTL_DAYS expires stored responses
+(default 30 days).
+
+Usage:
+    from agent.llm_cache import LLMDiskCache, llm_cache_key
+
+    cache = LLMDiskCache.for_project(projects_root, project_id)
+    key = llm_cache_key(request_kwargs)
+    response = cache.get(key)
+    if response is None:
+        response = ...  # call the provider
+        cache.put(key, response)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from agent.atomic_write import atomic_write_text
+
+
+def _default_capacity() -> int:
+    return int(os.environ.get("LLM_CACHE_MAX", "1024"))
+
+
+def llm_cache_enabled() -> bool:
+    """Return True unless LLM_CACHE is set to something other than "1"."""
+    return os.environ.get("LLM_CACHE", "1") == "1"
+
+
+def llm_cache_key(request: Dict[str, Any]) -> str:
+    """Build a cache key from the keyword arguments of a provider request.
+
+    Args:
+        request: Arguments passed to the provider's create() call
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON form of the request
+    """
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Thread-safe, bounded in-memory LRU of provider responses."""
+
+    def __init__(self, capacity: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            capacity: Maximum number of responses kept.
+                      Defaults to LLM_CACHE_MAX or 1024.
+        """
+        if capacity is None:
+            capacity = _default_capacity()
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on a miss."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response, evicting the least recently used one if full."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class LLMDiskCache:
+    """Per-project, content-addressed store of provider responses.
+
+    Each stored response carries the time it was cached; responses older
+    than the TTL are treated as misses and removed, whether they are found
+    in memory or on disk. A hit refreshes the file's mtime. The directory
+    is scanned once, on the first put, into an in-memory LRU index; after
+    that each put evicts from the index, deleting the least recently used
+    files once more than max_entries are stored, without listing the
+    directory again. Use for_project() to share one instance (and its
+    in-memory state) per cache directory.
+    """
+
+    # One instance per cache directory, see for_project()
+    _instances: Dict[Path, "LLMDiskCache"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_project(cls, projects_root: Path, project_id: str) -> "LLMDiskCache":
+        """Return the shared cache for a project, creating it on first use."""
+        cache_dir = (Path(projects_root) / project_id / ".llm_cache").resolve()
+        with cls._instances_lock:
+            cache = cls._instances.get(cache_dir)
+            if cache is None:
+                cache = cls._instances[cache_dir] = cls(projects_root, project_id)
+            return cache
+
+    def __init__(
+        self,
+        projects_root: Path,
+        project_id: str,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            projects_root: Root directory for projects
+            project_id: Project whose cache directory is used
+            max_entries: Maximum number of stored responses.
+                         Defaults to LLM_CACHE_MAX or 1024.
+            ttl_seconds: Age after which a response expires.
+                         Defaults to LLM_CACHE_TTL_DAYS (30) days.
+        """
+        self.cache_dir = Path(projects_root) / project_id / ".llm_cache"
+        self.max_entries = _default_capacity() if max_entries is None else max_entries
+        if ttl_seconds is None:
+            ttl_seconds = float(os.environ.get("LLM_CACHE_TTL_DAYS", "30")) * 86400
+        self.ttl_seconds = ttl_seconds
+        self._memory = LLMCache(self.max_entries)
+        # Keys stored on disk, least recently used first; None until loaded
+        self._index: "Optional[OrderedDict[str, None]]" = None
+        self._index_lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key[2:]}.json"
+
+    def _expired(self, response: Dict[str, Any]) -> bool:
+        return time.time() - response.get("cached_at", 0) > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on a miss."""
+        path = self._path(key)
+        response = self._memory.get(key)
+        if response is None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    response = json.load(f)
+            except (OSError, ValueError):
+                return None
+        if self._expired(response):
+            self._memory.discard(key)
+            with self._index_lock:
+                if self._index is not None:
+                    self._index.pop(key, None)
+            path.unlink(missing_ok=True)
+            return None
+        self._memory.set(key, response)
+        # Mark as recently used for eviction
+        with self._index_lock:
+            if self._index is not None and key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return response
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response in memory and atomically on disk (temp file, then rename)."""
+        response = dict(response, cached_at=time.time())
+        self._memory.set(key, response)
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(path, json.dumps(response, ensure_ascii=False))
+            self._evict(key)
+        except (IOError, OSError, TypeError, ValueError) as e:
+            # A cache write failure must not fail the call itself
+            print(f"Warning: Failed to cache LLM response {key}: {e}")
+
+    def _load_index(self) -> "OrderedDict[str, None]":
+        """Scan the cache directory into keys ordered by file mtime."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path.parent.name + path.stem))
+            except OSError:
+                continue
+        entries.sort()
+        return OrderedDict((key, None) for _, key in entries)
+
+    def _evict(self, key: str) -> None:
+        """Record key as stored and delete the least recently used files beyond max_entries."""
+        with self._index_lock:
+            if self._index is None:
+                self._index = self._load_index()
+            self._index[key] = None
+            self._index.move_to_end(key)
+            evicted = []
+            while len(self._index) > max(self.max_entries, 0):
+                evicted.append(self._index.popitem(last=False)[0])
+        for old_key in evicted:
+            self._memory.discard(old_key)
+            self._path(old_key).unlink(missing_ok=True)
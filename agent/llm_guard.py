@@ -9,6 +9,7 @@ Latency: ~200-500ms
 Author: Security Enhancement
 """
 
+import asyncio
 import json
 import os
 from typing import Tuple, Literal, Optional, Dict, Any
@@ -17,6 +18,15 @@ from pathlib import Path
 from agent.llm import call_model
 
 
+def is_degraded_verdict(details: Dict[str, Any]) -> bool:
+    """True if a guard verdict is a fail-closed fallback, not a classification.
+
+    That is the case when the guard call failed, its response could not be
+    parsed, or no provider was configured and a mock response came back.
+    """
+    return "error" in details or "raw_response" in details or bool(details.get("mock_response"))
+
+
 class LLMGuard:
     """AI-powered prompt injection detection using a separate LLM.
 
@@ -87,6 +97,7 @@ Only flag actual attempts to manipulate the AI system.
             projects_root or (Path(__file__).parent.parent / "projects")
         )
         self.enabled = self._check_if_enabled()
+        self.hedge_enabled = os.environ.get("SECURITY_LLM_GUARD_HEDGE", "false").lower() == "true"
 
     def _check_if_enabled(self) -> bool:
         """Check if LLM guard is enabled via environment variable."""
@@ -95,13 +106,15 @@ Only flag actual attempts to manipulate the AI system.
     def check_safety(
         self,
         user_input: str,
-        project_id: str
+        project_id: str,
+        guard_model: Optional[str] = None
     ) -> Tuple[Literal["SAFE", "SUSPICIOUS", "UNSAFE"], Dict[str, Any]]:
         """Use Guard LLM to check input safety.
 
         Args:
             user_input: Text to validate
             project_id: For cost logging
+            guard_model: Model to use (defaults to SECURITY_LLM_GUARD_MODEL)
 
         Returns:
             (classification, details_dict)
@@ -120,7 +133,7 @@ Only flag actual attempts to manipulate the AI system.
         prompt = self.GUARD_PROMPT_TEMPLATE.format(user_input=user_input)
 
         # Get preferred guard model from environment
-        guard_model = os.environ.get("SECURITY_LLM_GUARD_MODEL", "gpt-4o-mini")
+        guard_model = guard_model or os.environ.get("SECURITY_LLM_GUARD_MODEL", "gpt-4o-mini")
 
         try:
             # Call Guard LLM (use cheap, fast model)
@@ -132,8 +145,14 @@ Only flag actual attempts to manipulate the AI system.
                 escalate_on_low_confidence=False  # Don't escalate guard checks
             )
 
+            if result.get("error"):
+                raise RuntimeError(result["error"])
+
             # Parse response
             analysis = self._parse_guard_response(result.get("text", ""))
+            if result.get("source") == "mock":
+                # No provider configured for the guard model; not a real verdict
+                analysis["mock_response"] = True
 
             # Add metadata
             analysis["guard_enabled"] = True
@@ -155,6 +174,83 @@ Only flag actual attempts to manipulate the AI system.
                 "error": str(e)
             }
 
+    async def acheck_safety(
+        self,
+        user_input: str,
+        project_id: str
+    ) -> Tuple[Literal["SAFE", "SUSPICIOUS", "UNSAFE"], Dict[str, Any]]:
+        """Awaitable variant of check_safety.
+
+        The guard call runs in a worker thread so the event loop stays free
+        while the provider responds.
+
+        Args:
+            user_input: Text to validate
+            project_id: For cost logging
+
+        Returns:
+            (classification, details_dict)
+        """
+        if self.hedge_enabled:
+            return await self.acheck_safety_hedged(user_input, project_id)
+        return await asyncio.to_thread(self.check_safety, user_input, project_id)
+
+    async def acheck_safety_hedged(
+        self,
+        user_input: str,
+        project_id: str
+    ) -> Tuple[Literal["SAFE", "SUSPICIOUS", "UNSAFE"], Dict[str, Any]]:
+        """Race the primary and hedge guard models, keeping the first answer.
+
+        A degraded verdict (guard error, unparseable or mock response; see
+        is_degraded_verdict) does not win the race while the other model
+        is still running. The losing call is
+        cancelled; a request already sent to the provider still completes
+        in its worker thread and is cost-logged as usual.
+
+        Args:
+            user_input: Text to validate
+            project_id: For cost logging
+
+        Returns:
+            (classification, details_dict) with a "hedge_winner" entry
+        """
+        primary = os.environ.get("SECURITY_LLM_GUARD_MODEL", "gpt-4o-mini")
+        secondary = os.environ.get("SECURITY_LLM_GUARD_HEDGE_MODEL", "claude-3-haiku-20240307")
+        pending = {
+            asyncio.create_task(
+                asyncio.to_thread(self.check_safety, user_input, project_id, model)
+            )
+            for model in (primary, secondary)
+        }
+
+        verdict = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    verdict = task.result()
+                    if not is_degraded_verdict(verdict[1]):
+                        pending.update(done - {task})
+                        return self._mark_hedge_winner(verdict)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # Neither guard gave a real verdict; fall back to the last (fail-closed) one
+        return self._mark_hedge_winner(verdict)
+
+    def _mark_hedge_winner(
+        self,
+        verdict: Tuple[str, Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Record which guard model produced a hedged verdict."""
+        classification, details = verdict
+        details["hedge_winner"] = details.get("guard_model")
+        return classification, details
+
     def _parse_guard_response(self, response_text: str) -> Dict[str, Any]:
         """Parse JSON response from guard LLM.
 
@@ -13,7 +13,9 @@ Author: Intelligent Automation Agent
 """
 
 import json
+import os
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -40,6 +42,21 @@ class OptimizationDeliverablesOrchestrator:
 
     PHASE_DIR = "2-optimization"
 
+    # name -> (step number, label, output filename)
+    DELIVERABLE_STEPS = {
+        "value_stream": (1, "Value Stream Map", "value_stream_map.json"),
+        "waste_analysis": (2, "Waste Analysis", "waste_analysis.json"),
+        "quick_wins": (3, "Quick Wins", "quick_wins.json"),
+        "kpi_dashboard": (4, "KPI Dashboard", "kpi_dashboard.json"),
+    }
+
+    # Generators in a wave run in parallel; a wave starts once the previous
+    # one has finished (quick wins need the waste analysis, KPIs the VSM)
+    GENERATION_WAVES = (
+        ("value_stream", "waste_analysis"),
+        ("quick_wins", "kpi_dashboard"),
+    )
+
     def __init__(self, projects_root: str = "projects"):
         """
         Initialize the orchestrator.
@@ -117,102 +134,24 @@ class OptimizationDeliverablesOrchestrator:
             "completeness_by_deliverable": {}
         }
 
-        # Generate Value Stream Map
-        print("\n[1/4] Generating Value Stream Map...")
-        try:
-            vsm_result = self.vsm_gen.generate_value_stream(project_id)
-            results["deliverables"]["value_stream"] = vsm_result
-            results["completeness_by_deliverable"]["value_stream"] = vsm_result.get("completeness", {}).get("overall", 0)
-
-            if vsm_result.get("status") == "success" or vsm_result.get("status") == "partial":
-                if languages:
-                    lang_paths = self._copy_to_lang_dirs(project_id, "value_stream_map.json", languages)
-                    for lang, path in lang_paths.items():
-                        results["files_saved"][f"value_stream_{lang}"] = path
-                else:
-                    file_path = self.projects_root / project_id / "deliverables" / self.PHASE_DIR / "value_stream_map.json"
-                    results["files_saved"]["value_stream"] = str(file_path)
-                va_ratio = vsm_result.get("va_ratio", 0)
-                print(f"   ✓ Value Stream Map completed (VA Ratio: {va_ratio}%)")
-            else:
-                print(f"   ✗ Value Stream Map failed: {vsm_result.get('error')}")
-                results["status"] = "partial"
-        except Exception as e:
-            print(f"   ✗ Value Stream Map error: {str(e)}")
-            results["status"] = "partial"
-
-        # Generate Waste Analysis
-        print("\n[2/4] Analyzing Waste (TIMWOODS)...")
-        try:
-            waste_result = self.waste_gen.generate_waste_analysis(project_id)
-            results["deliverables"]["waste_analysis"] = waste_result
-            results["completeness_by_deliverable"]["waste_analysis"] = waste_result.get("completeness", {}).get("overall", 0)
-
-            if waste_result.get("status") == "success" or waste_result.get("status") == "partial":
-                if languages:
-                    lang_paths = self._copy_to_lang_dirs(project_id, "waste_analysis.json", languages)
-                    for lang, path in lang_paths.items():
-                        results["files_saved"][f"waste_analysis_{lang}"] = path
-                else:
-                    file_path = self.projects_root / project_id / "deliverables" / self.PHASE_DIR / "waste_analysis.json"
-                    results["files_saved"]["waste_analysis"] = str(file_path)
-                total_waste = waste_result.get("total_waste_instances", 0)
-                print(f"   ✓ Waste Analysis completed ({total_waste} waste instances identified)")
-            else:
-                print(f"   ✗ Waste Analysis failed: {waste_result.get('error')}")
-                results["status"] = "partial"
-        except Exception as e:
-            print(f"   ✗ Waste Analysis error: {str(e)}")
-            results["status"] = "partial"
-
-        # Generate Quick Wins
-        print("\n[3/4] Identifying Quick Wins...")
-        try:
-            qw_result = self.quick_wins_gen.generate_quick_wins(project_id)
-            results["deliverables"]["quick_wins"] = qw_result
-            results["completeness_by_deliverable"]["quick_wins"] = qw_result.get("completeness", {}).get("overall", 0)
-
-            if qw_result.get("status") == "success" or qw_result.get("status") == "partial":
-                if languages:
-                    lang_paths = self._copy_to_lang_dirs(project_id, "quick_wins.json", languages)
-                    for lang, path in lang_paths.items():
-                        results["files_saved"][f"quick_wins_{lang}"] = path
-                else:
-                    file_path = self.projects_root / project_id / "deliverables" / self.PHASE_DIR / "quick_wins.json"
-                    results["files_saved"]["quick_wins"] = str(file_path)
-                qw_count = qw_result.get("summary", {}).get("total_quick_wins", 0)
-                high_priority = qw_result.get("summary", {}).get("high_priority_count", 0)
-                print(f"   ✓ Quick Wins identified ({qw_count} total, {high_priority} high priority)")
-            else:
-                print(f"   ✗ Quick Wins failed: {qw_result.get('error')}")
-                results["status"] = "partial"
-        except Exception as e:
-            print(f"   ✗ Quick Wins error: {str(e)}")
-            results["status"] = "partial"
-
-        # Generate KPI Dashboard
-        print("\n[4/4] Building KPI Dashboard...")
-        try:
-            kpi_result = self.kpi_gen.generate_kpi_dashboard(project_id)
-            results["deliverables"]["kpi_dashboard"] = kpi_result
-            results["completeness_by_deliverable"]["kpi_dashboard"] = kpi_result.get("completeness", {}).get("overall", 0)
-
-            if kpi_result.get("status") == "success" or kpi_result.get("status") == "partial":
-                if languages:
-                    lang_paths = self._copy_to_lang_dirs(project_id, "kpi_dashboard.json", languages)
-                    for lang, path in lang_paths.items():
-                        results["files_saved"][f"kpi_dashboard_{lang}"] = path
-                else:
-                    file_path = self.projects_root / project_id / "deliverables" / self.PHASE_DIR / "kpi_dashboard.json"
-                    results["files_saved"]["kpi_dashboard"] = str(file_path)
-                kpi_count = kpi_result.get("kpi_dashboard", {}).get("summary", {}).get("total_kpis", 0)
-                print(f"   ✓ KPI Dashboard completed ({kpi_count} KPIs defined)")
-            else:
-                print(f"   ✗ KPI Dashboard failed: {kpi_result.get('error')}")
-                results["status"] = "partial"
-        except Exception as e:
-            print(f"   ✗ KPI Dashboard error: {str(e)}")
-            results["status"] = "partial"
+        # Run each wave in parallel; results are recorded in step order so
+        # the output does not depend on thread timing
+        generators = {
+            "value_stream": self.vsm_gen.generate_value_stream,
+            "waste_analysis": self.waste_gen.generate_waste_analysis,
+            "quick_wins": self.quick_wins_gen.generate_quick_wins,
+            "kpi_dashboard": self.kpi_gen.generate_kpi_dashboard,
+        }
+        max_workers = max(1, int(os.environ.get("OPT_PARALLEL", "4")))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for wave in self.GENERATION_WAVES:
+                futures = {}
+                for name in wave:
+                    step, label, _ = self.DELIVERABLE_STEPS[name]
+                    print(f"\n[{step}/4] Generating {label}...")
+                    futures[name] = pool.submit(generators[name], project_id)
+                for name, future in futures.items():
+                    self._record_result(results, project_id, languages, name, future)
 
         # Calculate overall completeness
         completeness_values = [v for v in results["completeness_by_deliverable"].values()]
@@ -242,6 +181,50 @@ class OptimizationDeliverablesOrchestrator:
 
         return results
 
+    def _record_result(
+        self,
+        results: Dict[str, Any],
+        project_id: str,
+        languages: Optional[List[str]],
+        name: str,
+        future: Future,
+    ) -> None:
+        """Store one generator's outcome in results and report it."""
+        _, label, filename = self.DELIVERABLE_STEPS[name]
+        try:
+            result = future.result()
+            results["deliverables"][name] = result
+            results["completeness_by_deliverable"][name] = result.get("completeness", {}).get("overall", 0)
+
+            if result.get("status") == "success" or result.get("status") == "partial":
+                if languages:
+                    lang_paths = self._copy_to_lang_dirs(project_id, filename, languages)
+                    for lang, path in lang_paths.items():
+                        results["files_saved"][f"{name}_{lang}"] = path
+                else:
+                    file_path = self.projects_root / project_id / "deliverables" / self.PHASE_DIR / filename
+                    results["files_saved"][name] = str(file_path)
+                print(f"   ✓ {label} completed ({self._describe_result(name, result)})")
+            else:
+                print(f"   ✗ {label} failed: {result.get('error')}")
+                results["status"] = "partial"
+        except Exception as e:
+            print(f"   ✗ {label} error: {str(e)}")
+            results["status"] = "partial"
+
+    @staticmethod
+    def _describe_result(name: str, result: Dict[str, Any]) -> str:
+        """Summarize a successful deliverable for the progress output."""
+        if name == "value_stream":
+            return f"VA Ratio: {result.get('va_ratio', 0)}%"
+        if name == "waste_analysis":
+            return f"{result.get('total_waste_instances', 0)} waste instances identified"
+        if name == "quick_wins":
+            summary = result.get("summary", {})
+            return f"{summary.get('total_quick_wins', 0)} total, {summary.get('high_priority_count', 0)} high priority"
+        kpi_count = result.get("kpi_dashboard", {}).get("summary", {}).get("total_kpis", 0)
+        return f"{kpi_count} KPIs defined"
+
     def _recommend_next_steps(self, results: Dict[str, Any]) -> List[str]:
         """
         Generate recommendations for next steps based on completeness.
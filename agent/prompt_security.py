@@ -7,8 +7,32 @@ Author: Security Enhancement
 """
 
 import re
-from typing import List, Tuple
-from dataclasses import dataclass
+import threading
+from typing import List, Set, Tuple
+from dataclasses import dataclass, field
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick  # optional: pyahocorasick, single-pass literal scan
+except ImportError:
+    ahocorasick = None
+
+
+# ASCII control characters that re's \s matches but hyperscan's does not
+_RE_ONLY_SPACE_RE = re.compile(r"[\x1c-\x1f]")
+
+
+def _is_plain_ascii(text: str) -> bool:
+    """True if hyperscan and re agree on every pattern for text."""
+    return text.isascii() and not _RE_ONLY_SPACE_RE.search(text)
+
+
+# Ordered integer codes for risk levels, for range comparisons
+RISK_CODE = {"safe": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
 
 
 @dataclass
@@ -19,6 +43,10 @@ class SecurityCheck:
     threats_detected: List[str]
     sanitized_input: str
     check_method: str  # "regex", "llm_guard", "hybrid"
+    risk_code: int = field(init=False)  # RISK_CODE of risk_level
+
+    def __post_init__(self):
+        self.risk_code = RISK_CODE[self.risk_level]
 
 
 class PromptInjectionDefense:
@@ -77,6 +105,118 @@ class PromptInjectionDefense:
         (r"sudo\s+", "mentions_sudo"),
     ]
 
+    def __init__(self):
+        """Compile the pattern sets once.
+
+        When hyperscan is installed, all injection and suspicious patterns
+        are compiled into a single database and matched in one linear-time
+        pass. Otherwise each pattern is pre-compiled with Python's re.
+        """
+        self._injection_res = [
+            re.compile(pattern, re.IGNORECASE) for pattern, _ in self.INJECTION_PATTERNS
+        ]
+        self._suspicious_res = [
+            re.compile(pattern, re.IGNORECASE) for pattern, _ in self.SUSPICIOUS_PATTERNS
+        ]
+        self._special_chars_re = re.compile(r'[<>{}[\]|\\`]')
+        self._pattern_res = self._injection_res + self._suspicious_res
+        self._hs_db = self._compile_hyperscan()
+        self._hs_scratch = threading.local()
+        self._literal_automaton = self._build_literal_automaton()
+        self._literal_ids: Set[int] = (
+            set(self._literal_automaton.values()) if self._literal_automaton is not None else set()
+        )
+
+    def _build_literal_automaton(self):
+        """Build an Aho-Corasick automaton over the literal injection patterns.
+
+        Patterns such as special chat tokens contain no regex syntax, so one
+        pass over the lowercased input finds all of them at once.
+        Returns None if pyahocorasick is unavailable or no pattern is literal.
+        """
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for i, (pattern, _) in enumerate(self.INJECTION_PATTERNS):
+            literal = re.sub(r"\\(.)", r"\1", pattern)
+            if re.escape(literal) == pattern:
+                automaton.add_word(literal.lower(), i)
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+
+    def _compile_hyperscan(self):
+        """Build a hyperscan block-mode database, or None if unavailable.
+
+        The database is only used for plain ASCII input (see
+        _matching_pattern_ids), so it is compiled without UTF-8 support.
+        """
+        if hyperscan is None:
+            return None
+        patterns = self.INJECTION_PATTERNS + self.SUSPICIOUS_PATTERNS
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=[pattern.encode("utf-8") for pattern, _ in patterns],
+                ids=list(range(len(patterns))),
+                flags=[flags] * len(patterns),
+            )
+            return db
+        except Exception:
+            # Unsupported pattern or platform; fall back to Python re
+            return None
+
+    def _matching_pattern_ids(self, user_input: str) -> Set[int]:
+        """Return indices (injection first, then suspicious) of matching patterns.
+
+        The result is always what the re patterns match. hyperscan folds
+        case and classifies whitespace differently from re (re matches
+        "İgnore" against "ignore", hyperscan does not), so it is only
+        consulted for plain ASCII input, and its hits are confirmed with re.
+        Without hyperscan, the literal automaton stands in for the literal
+        injection patterns on the same kind of input.
+        """
+        plain = _is_plain_ascii(user_input)
+        if self._hs_db is not None and plain:
+            # Scratch space is not shareable between concurrent scans
+            scratch = getattr(self._hs_scratch, "scratch", None)
+            if scratch is None:
+                scratch = self._hs_scratch.scratch = hyperscan.Scratch(self._hs_db)
+            matched: Set[int] = set()
+
+            def on_match(pattern_id, start, end, flags, context):
+                matched.add(pattern_id)
+
+            self._hs_db.scan(
+                user_input.encode("ascii"),
+                match_event_handler=on_match,
+                scratch=scratch,
+            )
+            # hyperscan only prefilters; re has the final say
+            return {i for i in matched if self._pattern_res[i].search(user_input)}
+
+        literal_ids: Set[int] = set()
+        matched: Set[int] = set()
+        if self._literal_automaton is not None and plain:
+            # ASCII lowercasing matches re's case folding exactly here
+            literal_ids = self._literal_ids
+            matched = {i for _, i in self._literal_automaton.iter(user_input.lower())}
+        matched.update(
+            i
+            for i, regex in enumerate(self._injection_res)
+            if i not in literal_ids and regex.search(user_input)
+        )
+        if not matched:
+            offset = len(self._injection_res)
+            matched = {
+                offset + i
+                for i, regex in enumerate(self._suspicious_res)
+                if regex.search(user_input)
+            }
+        return matched
+
     def check_input(
         self,
         user_input: str,
@@ -95,25 +235,27 @@ class PromptInjectionDefense:
         risk_level = "safe"
         threat_categories = set()
 
+        matched = self._matching_pattern_ids(user_input)
+
         # Check for critical injection patterns
-        for pattern, category in self.INJECTION_PATTERNS:
-            matches = re.findall(pattern, user_input, re.IGNORECASE)
-            if matches:
+        for i, (pattern, category) in enumerate(self.INJECTION_PATTERNS):
+            if i in matched:
                 threats.append(f"Injection pattern '{category}': {pattern}")
                 threat_categories.add(category)
                 risk_level = "critical"
 
         # If not critical, check for suspicious patterns
         if risk_level == "safe":
-            for pattern, category in self.SUSPICIOUS_PATTERNS:
-                if re.search(pattern, user_input, re.IGNORECASE):
+            offset = len(self.INJECTION_PATTERNS)
+            for i, (pattern, category) in enumerate(self.SUSPICIOUS_PATTERNS, offset):
+                if i in matched:
                     threats.append(f"Suspicious pattern '{category}': {pattern}")
                     threat_categories.add(category)
                     if risk_level == "safe":
                         risk_level = "low"
 
         # Check for excessive special characters (obfuscation attempts)
-        special_chars = len(re.findall(r'[<>{}[\]|\\`]', user_input))
+        special_chars = len(self._special_chars_re.findall(user_input))
         special_char_ratio = special_chars / max(len(user_input), 1)
         if special_char_ratio > 0.15:
             threats.append(f"High special character ratio: {special_char_ratio:.1%} ({special_chars} chars)")
@@ -329,7 +329,8 @@ Design practical, implementable self-healing strategies. Prioritize high-impact,
             agent="self_healing_generator",
             prompt=prompt,
             preferred_model="gpt-4o",  # Use premium model for resilience design
-            escalate_on_low_confidence=False
+            escalate_on_low_confidence=False,
+            use_cache=True,
         )
 
         # Parse JSON response
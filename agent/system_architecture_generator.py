@@ -41,12 +41,13 @@ class SystemArchitectureGenerator:
         """
         self.projects_root = Path(projects_root)
 
-    def generate_system_architecture(self, project_id: str) -> Dict[str, Any]:
+    def generate_system_architecture(self, project_id: str, output_dir: Optional[Path] = None) -> Dict[str, Any]:
         """
         Generate System Architecture from project knowledge base.
 
         Args:
             project_id: ID of the project to analyze
+            output_dir: Optional directory to save into (defaults to the phase folder)
 
         Returns:
             Dict with system architecture structure:
@@ -142,7 +143,7 @@ class SystemArchitectureGenerator:
                 }
             }
 
-            self._save_deliverable(project_id, deliverable_data)
+            self._save_deliverable(project_id, deliverable_data, output_dir)
 
             return {
                 "status": "success" if not missing else "partial",
@@ -393,15 +394,16 @@ class SystemArchitectureGenerator:
         else:
             return "low"
 
-    def _save_deliverable(self, project_id: str, data: Dict[str, Any]) -> None:
+    def _save_deliverable(self, project_id: str, data: Dict[str, Any], output_dir: Optional[Path] = None) -> None:
         """
         Save system architecture to project deliverables folder.
 
         Args:
             project_id: Project ID
             data: System architecture data
+            output_dir: Optional directory override (e.g. a language subdirectory)
         """
-        deliverable_path = (
+        deliverable_path = output_dir or (
             self.projects_root / project_id / "deliverables" / "3-digitization"
         )
         deliverable_path.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,91 @@
+"""Tests for the background cost log writer (agent.llm)."""
+
+import json
+import threading
+import time
+
+import pytest
+
+import agent.llm as llm
+from agent.llm import append_cost_log, flush_cost_logs, load_cost_log
+
+PROJECT_ID = "cost-test"
+
+
+@pytest.fixture(autouse=True)
+def drained_writer():
+    assert flush_cost_logs(5.0)
+    yield
+    assert flush_cost_logs(5.0)
+
+
+def write_legacy_log(tmp_path, entries):
+    project_dir = tmp_path / PROJECT_ID
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "cost_log.json").write_text(json.dumps(entries), encoding="utf-8")
+
+
+def test_flush_is_bounded_when_writer_is_wedged(tmp_path, monkeypatch, capsys):
+    release = threading.Event()
+    real_write = llm._write_cost_log_batch
+
+    def wedged_write(batch):
+        release.wait(10)
+        real_write(batch)
+
+    monkeypatch.setattr(llm, "_write_cost_log_batch", wedged_write)
+    monkeypatch.setattr(llm, "COST_LOG_FLUSH_TIMEOUT", 0.2)
+    try:
+        append_cost_log(tmp_path, PROJECT_ID, {"cost_usd": 0.1})
+
+        start = time.monotonic()
+        entries = load_cost_log(tmp_path, PROJECT_ID)
+
+        assert time.monotonic() - start < 2
+        assert entries == []
+        assert "did not drain" in capsys.readouterr().out
+    finally:
+        release.set()
+    assert flush_cost_logs(5.0)
+    assert load_cost_log(tmp_path, PROJECT_ID) == [{"cost_usd": 0.1}]
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_dead_writer_is_restarted_on_next_append(tmp_path, monkeypatch):
+    real_write = llm._write_cost_log_batch
+
+    def fatal_write(batch):
+        # Not an Exception, so the worker loop does not catch it
+        raise SystemExit
+
+    monkeypatch.setattr(llm, "_write_cost_log_batch", fatal_write)
+    append_cost_log(tmp_path, PROJECT_ID, {"cost_usd": 0.1})
+    assert flush_cost_logs(5.0)
+    dead_worker = llm._COST_LOG_WORKER
+    dead_worker.join(5)
+    assert not dead_worker.is_alive()
+
+    monkeypatch.setattr(llm, "_write_cost_log_batch", real_write)
+    append_cost_log(tmp_path, PROJECT_ID, {"cost_usd": 0.2})
+
+    assert llm._COST_LOG_WORKER is not dead_worker
+    assert load_cost_log(tmp_path, PROJECT_ID) == [{"cost_usd": 0.2}]
+
+
+def test_load_reads_legacy_and_jsonl_logs(tmp_path):
+    write_legacy_log(tmp_path, [{"cost_usd": 0.1}])
+    (tmp_path / PROJECT_ID / "cost_log.jsonl").write_text(
+        json.dumps({"cost_usd": 0.2}) + "\n", encoding="utf-8"
+    )
+
+    assert load_cost_log(tmp_path, PROJECT_ID) == [{"cost_usd": 0.1}, {"cost_usd": 0.2}]
+
+
+def test_load_reads_migrated_legacy_log(tmp_path):
+    write_legacy_log(tmp_path, [{"cost_usd": 0.1}, {"cost_usd": 0.2}])
+
+    append_cost_log(tmp_path, PROJECT_ID, {"cost_usd": 0.3})
+    entries = load_cost_log(tmp_path, PROJECT_ID)
+
+    assert not (tmp_path / PROJECT_ID / "cost_log.json").exists()
+    assert entries == [{"cost_usd": 0.1}, {"cost_usd": 0.2}, {"cost_usd": 0.3}]
@@ -0,0 +1,66 @@
+"""Tests for the shared JSON file cache (agent.json_cache)."""
+
+import json
+import os
+
+import pytest
+
+import agent.json_cache as json_cache
+from agent.json_cache import cached_load
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(json_cache, "_JSON_CACHE", json_cache.OrderedDict())
+
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    calls = []
+    real_load = json_cache._load_json
+
+    def counting_load(path):
+        calls.append(path)
+        return real_load(path)
+
+    monkeypatch.setattr(json_cache, "_load_json", counting_load)
+    return calls
+
+
+def test_unchanged_file_is_parsed_once(tmp_path, count_parses):
+    path = tmp_path / "knowledge_base.json"
+    path.write_text(json.dumps({"facts": [{"fact": "a"}]}), encoding="utf-8")
+
+    first = cached_load(path)
+    second = cached_load(path)
+
+    assert len(count_parses) == 1
+    assert second is first
+    assert second == {"facts": [{"fact": "a"}]}
+
+
+def test_changed_file_is_parsed_again(tmp_path, count_parses):
+    path = tmp_path / "knowledge_base.json"
+    path.write_text(json.dumps({"facts": []}), encoding="utf-8")
+    cached_load(path)
+
+    path.write_text(json.dumps({"facts": ["b"]}), encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert cached_load(path) == {"facts": ["b"]}
+    assert len(count_parses) == 2
+
+
+def test_cache_is_bounded(tmp_path, monkeypatch, count_parses):
+    monkeypatch.setattr(json_cache, "JSON_CACHE_MAX", 2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file{i}.json"
+        path.write_text(json.dumps({"i": i}), encoding="utf-8")
+        paths.append(path)
+        cached_load(path)
+
+    assert len(json_cache._JSON_CACHE) == 2
+    cached_load(paths[0])  # evicted, so parsed again
+    assert len(count_parses) == 4
@@ -0,0 +1,109 @@
+"""Tests for the knowledge processor's file pipeline (agent.knowledge_processor)."""
+
+import asyncio
+
+import pytest
+
+import agent.knowledge_processor as knowledge_processor
+from agent.knowledge_processor import KnowledgeProcessor
+from agent.prompt_security import SecurityCheck
+
+PROJECT_ID = "pipeline-test"
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    # Fewer workers than files, so every stage reuses its workers, and a
+    # different count per stage, so each needs its own end markers
+    monkeypatch.setattr(knowledge_processor, "READ_CONCURRENCY", 1)
+    monkeypatch.setattr(knowledge_processor, "SCREEN_CONCURRENCY", 2)
+    monkeypatch.setattr(knowledge_processor, "EXTRACT_CONCURRENCY", 3)
+    uploaded = tmp_path / PROJECT_ID / "knowledge" / "uploaded"
+    uploaded.mkdir(parents=True)
+    for i in range(7):
+        (uploaded / f"doc{i}.txt").write_text(f"content {i}", encoding="utf-8")
+    return KnowledgeProcessor(tmp_path)
+
+
+def stub_stages(processor, monkeypatch, calls, fail_read=(), fail_screen=(), fail_extract=()):
+    """Replace the read, screen and extract handlers with fast fakes."""
+
+    async def fake_read(file_path):
+        calls["read"].append(file_path.name)
+        await asyncio.sleep(0)
+        if file_path.name in fail_read:
+            raise OSError("unreadable")
+        return file_path.read_text(encoding="utf-8")
+
+    async def fake_screen(user_input, project_id, context):
+        calls["screen"].append(user_input)
+        await asyncio.sleep(0)
+        if any(user_input.endswith(name[3]) for name in fail_screen):
+            raise RuntimeError("guard down")
+        return SecurityCheck(is_safe=True, risk_level="low", threats_detected=[], sanitized_input=user_input, check_method="hybrid")
+
+    async def fake_extract(project_id, file_path, content, content_sha, security_check, now_iso):
+        calls["extract"].append(file_path.name)
+        await asyncio.sleep(0)
+        if file_path.name in fail_extract:
+            raise ValueError("bad extraction")
+        return {
+            "timestamp": now_iso,
+            "source_file": file_path.name,
+            "content_sha": content_sha,
+            "status": "success",
+            "extraction": {"facts": [{"fact": content, "source": file_path.name}]},
+        }
+
+    monkeypatch.setattr(processor, "_aread_file", fake_read)
+    monkeypatch.setattr(processor.security_checker, "acheck_input", fake_screen)
+    monkeypatch.setattr(processor, "_aprocess_file", fake_extract)
+
+
+def run(processor):
+    return asyncio.run(asyncio.wait_for(processor.aprocess_project(PROJECT_ID), timeout=5))
+
+
+def test_every_file_gets_exactly_one_result(processor, monkeypatch):
+    calls = {"read": [], "screen": [], "extract": []}
+    stub_stages(processor, monkeypatch, calls)
+
+    result = run(processor)
+
+    names = sorted(entry["source_file"] for entry in result["analysis_log"])
+    assert names == [f"doc{i}.txt" for i in range(7)]
+    assert sorted(calls["extract"]) == names
+    assert len(calls["screen"]) == 7
+
+
+def test_stage_failures_do_not_hang_the_pipeline(processor, monkeypatch):
+    calls = {"read": [], "screen": [], "extract": []}
+    stub_stages(
+        processor, monkeypatch, calls,
+        fail_read={"doc1.txt"}, fail_screen={"doc3.txt"}, fail_extract={"doc5.txt"},
+    )
+
+    result = run(processor)
+
+    by_file = {entry["source_file"]: entry for entry in result["analysis_log"]}
+    assert len(result["analysis_log"]) == 7
+    for name, error in (("doc1.txt", "unreadable"), ("doc3.txt", "guard down"), ("doc5.txt", "bad extraction")):
+        assert by_file[name]["status"] == "error"
+        assert by_file[name]["error"] == error
+    assert sum(entry["status"] == "success" for entry in by_file.values()) == 4
+    # A file that failed upstream never reaches the later stages
+    assert "doc1.txt" not in calls["extract"]
+    assert "doc3.txt" not in calls["extract"]
+
+
+def test_stages_shut_down_with_no_files(tmp_path, monkeypatch):
+    (tmp_path / PROJECT_ID / "knowledge" / "uploaded").mkdir(parents=True)
+    processor = KnowledgeProcessor(tmp_path)
+    calls = {"read": [], "screen": [], "extract": []}
+    stub_stages(processor, monkeypatch, calls)
+
+    result = run(processor)
+
+    assert result["status"] == "success"
+    assert result["files_processed"] == 0
+    assert calls == {"read": [], "screen": [], "extract": []}
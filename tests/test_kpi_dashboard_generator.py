@@ -0,0 +1,33 @@
+"""Tests for KPI generation (agent.kpi_dashboard_generator)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agent.kpi_dashboard_generator import KPIDashboardGenerator
+
+# Inputs and the KPIs the per-category generators produced for them before
+# KPI generation was driven by KPI_METRIC_BINDINGS
+CASES = json.loads(
+    (Path(__file__).parent / "fixtures" / "kpi_dashboard_cases.json").read_text(encoding="utf-8")
+)
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_generate_all_kpis_matches_reference_output(case, tmp_path):
+    fixture = CASES[case]
+    generator = KPIDashboardGenerator(tmp_path)
+
+    kpis = generator._generate_all_kpis(fixture["baseline_metrics"], fixture["value_stream"])
+
+    assert kpis == fixture["expected"]
+
+
+def test_every_template_has_a_metric_binding():
+    names = {
+        template.name
+        for templates in KPIDashboardGenerator.KPI_TEMPLATES.values()
+        for template in templates
+    }
+    assert names == set(KPIDashboardGenerator.KPI_METRIC_BINDINGS)
@@ -0,0 +1,58 @@
+"""Tests for the LLM response cache (agent.llm_cache)."""
+
+from agent.llm_cache import LLMDiskCache
+
+KEY = "ab" + "0" * 62
+
+
+def test_memory_layer_is_scoped_per_projects_root(tmp_path):
+    first = LLMDiskCache.for_project(tmp_path / "one", "p")
+    second = LLMDiskCache.for_project(tmp_path / "two", "p")
+    first.put(KEY, {"text": "answer"})
+
+    assert LLMDiskCache.for_project(tmp_path / "one", "p") is first
+    assert first.get(KEY)["text"] == "answer"
+    assert second.get(KEY) is None
+
+
+def test_expired_memory_hit_is_a_miss(tmp_path):
+    cache = LLMDiskCache(tmp_path, "p", ttl_seconds=60)
+    cache.put(KEY, {"text": "answer"})
+    assert cache.get(KEY) is not None
+
+    cache.ttl_seconds = -1
+
+    assert cache.get(KEY) is None
+    assert not cache._path(KEY).exists()
+
+
+def test_put_evicts_least_recently_used_without_rescanning(tmp_path, monkeypatch):
+    cache = LLMDiskCache(tmp_path, "p", max_entries=2)
+    scans = []
+    real_load_index = cache._load_index
+    monkeypatch.setattr(cache, "_load_index", lambda: scans.append(1) or real_load_index())
+    keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+
+    cache.put(keys[0], {"text": "0"})
+    cache.put(keys[1], {"text": "1"})
+    cache.get(keys[0])  # keys[1] is now the least recently used
+    cache.put(keys[2], {"text": "2"})
+
+    assert len(scans) == 1
+    assert cache._path(keys[0]).exists()
+    assert not cache._path(keys[1]).exists()
+    assert cache._path(keys[2]).exists()
+    assert cache.get(keys[1]) is None
+
+
+def test_index_is_loaded_from_existing_files(tmp_path):
+    keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+    writer = LLMDiskCache(tmp_path, "p")
+    for key in keys[:2]:
+        writer.put(key, {"text": key})
+
+    cache = LLMDiskCache(tmp_path, "p", max_entries=2)
+    cache.put(keys[2], {"text": keys[2]})
+
+    assert sum(cache._path(key).exists() for key in keys) == 2
+    assert cache._path(keys[2]).exists()
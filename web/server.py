@@ -31,6 +31,7 @@ from agent.digitization_deliverables import DigitizationDeliverablesOrchestrator
 from agent.automation_deliverables import AutomationDeliverablesOrchestrator
 from agent.autonomization_deliverables import AutonomizationDeliverablesOrchestrator
 from agent.gate_review_agent import GateReviewAgent
+from agent.llm import load_cost_log, prewarm_clients
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-key-change-in-production")
@@ -119,17 +120,14 @@ def project_dashboard(project_id: str):
         uploaded_files = list(upload_dir.glob('*.*')) if upload_dir.exists() else []
 
         # Get cost log summary
-        cost_path = pm.config.projects_root / project_id / "cost_log.json"
         total_cost = 0.0
         api_calls = 0
-        if cost_path.exists():
-            try:
-                with open(cost_path, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
-                    api_calls = len(logs)
-                    total_cost = sum(log.get('cost_usd', 0.0) for log in logs)
-            except Exception:
-                pass
+        try:
+            logs = load_cost_log(pm.config.projects_root, project_id)
+            api_calls = len(logs)
+            total_cost = sum(log.get('cost_usd', 0.0) for log in logs)
+        except Exception:
+            pass
 
         # Get knowledge base breakdown by category
         kb_breakdown = {}
@@ -152,7 +150,7 @@ def project_dashboard(project_id: str):
         try:
             from agent.gap_analyzer import GapAnalyzer
             ga = GapAnalyzer(pm.config.projects_root)
-            gap_result = ga.analyze_project(project_id)
+            gap_result = ga.analyze_project(project_id, include_knowledge_summary=False)
             if gap_result.get('status') == 'success':
                 gap_data = gap_result
         except Exception:
@@ -566,14 +564,10 @@ def api_get_cost_log(project_id: str):
         if not project:
             return jsonify({'error': f"Project '{project_id}' not found"}), 404
 
-        cost_path = pm.config.projects_root / project_id / "cost_log.json"
-
-        if not cost_path.exists():
+        logs = load_cost_log(pm.config.projects_root, project_id)
+        if not logs:
             return jsonify([])
 
-        with open(cost_path, 'r', encoding='utf-8') as f:
-            logs = json.load(f)
-
         # Calculate summary
         total_cost = sum(log.get('cost_usd', 0.0) for log in logs)
         total_input_tokens = sum(log.get('input_tokens', 0) for log in logs)
@@ -683,4 +677,5 @@ if __name__ == '__main__':
     print("🌐 Server running at: http://localhost:5000")
     print("\n✅ Ready for UAT!")
 
+    prewarm_clients()
     app.run(debug=True, host='0.0.0.0', port=5000)